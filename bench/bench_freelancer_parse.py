@@ -0,0 +1,63 @@
+"""Benchmark the Freelancer job-card parser against saved listing pages.
+
+Compares the original full-tree html.parser parse with parse_freelancer_jobs
+(job-card SoupStrainer + lxml when available) on every fixture in
+bench/fixtures/*.html:
+
+    python bench/bench_freelancer_parse.py --repeat 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+import bot  # noqa: E402
+
+
+def parse_full_tree(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    new_jobs = []
+    for job in soup.find_all('div', class_='JobSearchCard-item'):
+        title_element = job.find('a', class_='JobSearchCard-primary-heading-link')
+        title = title_element.text.strip() if title_element else "No Title"
+        link = f"https://www.freelancer.com{title_element['href']}" if title_element else "No Link"
+        description_element = job.find('p', class_='JobSearchCard-primary-description')
+        description = description_element.text.strip() if description_element else "No Description"
+        new_jobs.append((title, link, description))
+    return new_jobs
+
+
+def measure(parse, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"parser: {bot.FREELANCER_PARSER}")
+    print(f"{'fixture':<28} {'cards':>5} {'full tree ms':>13} {'strained ms':>12} {'speedup':>8}")
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_bytes()
+        expected = parse_full_tree(html)
+        if bot.parse_freelancer_jobs(html) != expected:
+            sys.exit(f"{path.name}: parse_freelancer_jobs disagrees with the full-tree parse")
+        baseline = measure(parse_full_tree, html, args.repeat)
+        strained = measure(bot.parse_freelancer_jobs, html, args.repeat)
+        print(f"{path.name:<28} {len(expected):>5} {baseline:>13.2f} {strained:>12.2f} {baseline / strained:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
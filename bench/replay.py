@@ -0,0 +1,262 @@
+"""Offline replay benchmark for the job pipeline.
+
+Feeds recorded scrape_jobs DataFrames and saved Freelancer HTML through the real
+filter -> dedup -> persist -> post path, using fake Discord channels and a
+temporary SQLite database. No LinkedIn, Freelancer or Discord access is needed.
+
+    python bench/replay.py                                # 50, 1k and 100k rows
+    python bench/replay.py --sizes 1000 --jobs scrape.pkl --json results.json
+    python bench/replay.py --search ng_2025               # route to another search's channels
+    python bench/replay.py --min-rows-per-sec 5000        # exit 1 if slower
+
+Recorded DataFrames (--jobs) can be .pkl, .csv or .parquet files, e.g. saved with
+``jobs.to_pickle(...)`` from get_jobs. Rows are resampled with fresh ids to reach
+each size; resampled rows are reposts of each other, so repost fingerprinting is
+off unless --fingerprints is given.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+
+# Fake channel ids, one per channel in feeds.json
+CHANNEL_ENVS = ('FT_CHANNEL_ID', 'BC_CHANNEL_ID', 'MO_CHANNEL_ID', 'ML_CHANNEL_ID', 'INTERN_CHANNEL_ID',
+                'NG_2025_CHANNEL_ID', 'NG_2024_CHANNEL_ID', 'FREELANCER_CHANNEL_ID')
+for offset, name in enumerate(CHANNEL_ENVS):
+    os.environ[name] = str(1000 + offset)
+
+import bot  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix="replay-")
+
+# Deliver immediately instead of pacing for Discord
+bot.SEND_COALESCE_SECONDS = 0
+bot.SEND_BUCKET_SECONDS = 0
+
+
+class FakeChannel:
+    def __init__(self, channel_id, latency=0.0):
+        self.id = channel_id
+        self.name = f"fake-{channel_id}"
+        self.latency = latency
+        self.messages = 0
+
+    async def send(self, content=None, embeds=None, embed=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+
+
+# Keeps every observation so stages can be reported as percentiles
+class RecordingHistogram(bot.MetricHistogram):
+    def __init__(self, stage, original):
+        super().__init__(original.name, original.help, original.label_names, original.buckets)
+        self.stage = stage
+        self.samples = defaultdict(list)
+
+    def observe(self, value, **labels):
+        super().observe(value, **labels)
+        label = "/".join(str(labels[name]) for name in self.label_names if name not in ('channel', 'feed'))
+        self.samples[f"{self.stage}/{label}" if label else self.stage].append(value)
+
+
+def install_recorders():
+    recorders = {
+        'FILTER_SECONDS': 'filter',
+        'DB_SECONDS': 'db',
+        'DISCORD_SEND_SECONDS': 'discord_send',
+        'FREELANCER_FETCH_SECONDS': 'freelancer_fetch_parse',
+    }
+    installed = []
+    for attribute, stage in recorders.items():
+        recorder = RecordingHistogram(stage, getattr(bot, attribute))
+        setattr(bot, attribute, recorder)
+        installed.append(recorder)
+    return installed
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def load_jobs(paths):
+    if not paths:
+        paths = [FIXTURES / "linkedin_jobs.csv"]
+    frames = []
+    for path in map(Path, paths):
+        if path.suffix == ".pkl":
+            frames.append(pd.read_pickle(path))
+        elif path.suffix == ".parquet":
+            frames.append(pd.read_parquet(path))
+        else:
+            frames.append(pd.read_csv(path))
+    return pd.concat(frames, ignore_index=True)
+
+
+def resample(jobs, size, seed):
+    sample = jobs.sample(n=size, replace=size > len(jobs), random_state=seed).reset_index(drop=True)
+    sample['id'] = [f"li-replay-{seed}-{i}" for i in range(size)]
+    return sample
+
+
+def open_databases(directory, label):
+    generic_engine = bot.create_database_engine(f"sqlite:///{directory}/jobs-{label}.db", bot.JOBS_TABLES)
+    freelancer_engine = bot.create_database_engine(f"sqlite:///{directory}/freelancer-{label}.db", bot.FREELANCER_TABLES)
+    return (bot.Database(sessionmaker(bind=generic_engine), "jobs"),
+            bot.Database(sessionmaker(bind=freelancer_engine), "freelancer"))
+
+
+async def make_bot(directory, label, latency):
+    jobs_db, freelancer_db = open_databases(directory, label)
+    job_bot = bot.CombinedJobBot(jobs_db=jobs_db, freelancer_db=freelancer_db)
+    channels = {int(os.environ[name]): FakeChannel(int(os.environ[name]), latency) for name in CHANNEL_ENVS}
+    job_bot.get_channel = channels.get
+
+    async def ready():
+        return None
+
+    job_bot.wait_until_ready = ready
+    return job_bot, channels
+
+
+# Waits for every queued post to be delivered and persisted
+async def drain(job_bot):
+    await asyncio.gather(*(queue.join() for queue in job_bot.send_queues.values()))
+    for queue in job_bot.send_queues.values():
+        queue.stop()
+    await job_bot.jobs_db.close()
+    await job_bot.freelancer_db.close()
+    job_bot.scrape_executor.shutdown()
+
+
+async def replay_jobs(jobs, args, label):
+    job_bot, channels = await make_bot(WORKDIR, label, args.send_latency)
+    # Routed like run_feed routes one search's scrape: only to that search's channels
+    channel_ids = job_bot.feeds.channel_ids(job_bot.feeds.searches[args.search].channels)
+    started = time.perf_counter()
+    new_jobs = await job_bot.route_jobs([jobs], channel_ids)
+    routed = time.perf_counter()
+    await drain(job_bot)
+    finished = time.perf_counter()
+    return {
+        'new_jobs': new_jobs,
+        'messages': sum(channel.messages for channel in channels.values()),
+        'route_seconds': routed - started,
+        'total_seconds': finished - started,
+    }
+
+
+async def replay_freelancer(html, args, label):
+    job_bot, channels = await make_bot(WORKDIR, label, args.send_latency)
+
+    async def fetch():
+        return html
+
+    job_bot.freelancer_fetcher.fetch = fetch
+    started = time.perf_counter()
+    tracker = await job_bot.post_freelancer_jobs()
+    routed = time.perf_counter()
+    await drain(job_bot)
+    finished = time.perf_counter()
+    return {
+        'new_jobs': tracker.delivered,
+        'messages': sum(channel.messages for channel in channels.values()),
+        'route_seconds': routed - started,
+        'total_seconds': finished - started,
+    }
+
+
+async def run_case(name, rows, replay, args):
+    recorders = install_recorders()
+    result = await replay(f"{name}-timed")
+    result.update(name=name, rows=rows, rows_per_sec=rows / result['total_seconds'] if result['total_seconds'] else 0)
+    result['stages'] = {}
+    for recorder in recorders:
+        for stage, samples in sorted(recorder.samples.items()):
+            result['stages'][stage] = {
+                'count': len(samples),
+                'p50_ms': percentile(samples, 0.50) * 1000,
+                'p99_ms': percentile(samples, 0.99) * 1000,
+                'total_ms': sum(samples) * 1000,
+            }
+    if args.memory:
+        # Separate pass: tracemalloc slows everything down, so it's kept out of the timings
+        tracemalloc.start()
+        await replay(f"{name}-memory")
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return result
+
+
+def print_result(result):
+    memory = f", peak {result['peak_memory_mb']:.1f} MiB" if 'peak_memory_mb' in result else ""
+    print(f"\n{result['name']}: {result['rows']} rows, {result['new_jobs']} new jobs in {result['messages']} messages, "
+          f"{result['total_seconds'] * 1000:.1f} ms ({result['rows_per_sec']:,.0f} rows/s{memory})")
+    print(f"  {'stage':<28} {'count':>7} {'p50 ms':>9} {'p99 ms':>9} {'total ms':>10}")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<28} {stats['count']:>7} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+              f"{stats['total_ms']:>10.1f}")
+
+
+async def run(args):
+    jobs = load_jobs(args.jobs)
+    results = []
+    for size in args.sizes:
+        # Projected the way get_jobs does it, outside the timed pipeline
+        records = bot.job_records(resample(jobs, size, args.seed), descriptions=bot.FINGERPRINT_SIMHASH)
+        results.append(await run_case(
+            f"jobs-{size}", size, lambda label, records=records: replay_jobs(records, args, label), args))
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_bytes()
+        rows = len(bot.parse_freelancer_jobs(html))
+        results.append(await run_case(
+            f"freelancer-{path.stem}", rows, lambda label, html=html: replay_freelancer(html, args, label), args))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay benchmark for the job pipeline")
+    parser.add_argument("--sizes", default="50,1000,100000",
+                        type=lambda value: [int(size) for size in value.split(",") if size])
+    parser.add_argument("--jobs", nargs="*", help="recorded scrape_jobs DataFrames (.pkl, .csv, .parquet)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--search", default="full_time", help="feeds.json search whose channels the jobs are routed to")
+    parser.add_argument("--send-latency", type=float, default=0.0, help="fake Discord send latency in seconds")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the peak memory pass")
+    parser.add_argument("--log-level", default="WARNING", help="bot logger level during the replay")
+    parser.add_argument("--fingerprints", action="store_true", help="keep repost fingerprinting on")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--min-rows-per-sec", type=float, help="fail if any job replay is slower than this")
+    args = parser.parse_args()
+    bot.logger.setLevel(args.log_level.upper())
+    if not args.fingerprints:
+        bot.FINGERPRINT_WINDOW_DAYS = 0
+
+    results = asyncio.run(run(args))
+    for result in results:
+        print_result(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    if args.min_rows_per_sec is not None:
+        slow = [r['name'] for r in results if r['name'].startswith("jobs-") and r['rows_per_sec'] < args.min_rows_per_sec]
+        if slow:
+            sys.exit(f"below {args.min_rows_per_sec:,.0f} rows/s: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    main()
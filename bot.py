@@ -1,19 +1,39 @@
 import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
+import math
 import os
 import platform
 import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+# Reference point for the startup timings (import, databases, gateway) logged at startup
+STARTED_AT = time.perf_counter()
+
 import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean
+from sqlalchemy import create_engine, delete, event, func, inspect, select, text, update, Column, Index, Integer, String, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import IntegrityError
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-from jobspy import scrape_jobs
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import aiohttp
+from aiohttp import web
+from datetime import datetime, timedelta
+# jobspy, pandas, numpy and bs4 are slow to import and only needed once scraping
+# starts, so they're imported where they're used
 
 # Load environment variables
 load_dotenv()
@@ -37,130 +57,336 @@ class LoggingFormatter(logging.Formatter):
         logging.CRITICAL: red + bold,
     }
 
+    def __init__(self):
+        super().__init__()
+        # One formatter per level, built once instead of on every record
+        self.formatters = {}
+        for level, log_color in self.COLORS.items():
+            format = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
+            format = format.replace("(black)", self.black + self.bold)
+            format = format.replace("(reset)", self.reset)
+            format = format.replace("(levelcolor)", log_color)
+            format = format.replace("(green)", self.green + self.bold)
+            self.formatters[level] = logging.Formatter(format, "%Y-%m-%d %H:%M:%S", style="{")
+
     def format(self, record):
-        log_color = self.COLORS[record.levelno]
-        format = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
-        format = format.replace("(black)", self.black + self.bold)
-        format = format.replace("(reset)", self.reset)
-        format = format.replace("(levelcolor)", log_color)
-        format = format.replace("(green)", self.green + self.bold)
-        formatter = logging.Formatter(format, "%Y-%m-%d %H:%M:%S", style="{")
+        formatter = self.formatters.get(record.levelno, self.formatters[logging.INFO])
         return formatter.format(record)
 
 logger = logging.getLogger("discord_bot")
-logger.setLevel(logging.INFO)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
 
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(LoggingFormatter())
-file_handler = logging.FileHandler(filename="discord.log", encoding="utf-8", mode="w")
-file_handler_formatter = logging.Formatter(
-    "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
-)
-file_handler.setFormatter(file_handler_formatter)
 
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+# Records are handed to a queue on the calling thread; a listener thread does the
+# formatting and the console/file writes, so the event loop never blocks on disk.
+def setup_logging():
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(LoggingFormatter())
+    file_handler = logging.FileHandler(filename="discord.log", encoding="utf-8", mode="w")
+    file_handler_formatter = logging.Formatter(
+        "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
+    )
+    file_handler.setFormatter(file_handler_formatter)
 
-# --- Database Setup ---
-Base = declarative_base()
-engine = create_engine("sqlite:///jobs.db", echo=False) # Database for generic job scraper
-Base.metadata.create_all(engine)
-Session = sessionmaker(bind=engine)
-session = Session()
+    log_queue = SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
-# --- Generic Job Models ---
-class FullTimeJob(Base):
-    __tablename__ = "full_time_jobs"
+# --- Metrics ---
+# Minimal Prometheus text-format metrics, served on METRICS_HOST:METRICS_PORT (0 disables)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
 
-    id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String, unique=True)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
 
-class BlockchainJob(Base):
-    __tablename__ = "blockchain_jobs"
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
 
-    id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String, unique=True)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
 
-# ... (other generic job models: MobileJob, MachineLearningJob, InternJob, NG2025Job, NG2024Job) ...
-class MobileJob(Base):
-    __tablename__ = "mobile_jobs"
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
 
-    id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String, unique=True)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
 
-class MachinLearningJob(Base):
-    __tablename__ = "machin_learning_jobs"
+class Metric:
+    kind = None
 
-    id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String, unique=True)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values = {}
 
-class InternJob(Base):
-    __tablename__ = "intern_jobs"
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.label_names)
 
-    id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String, unique=True)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{format_labels(self.label_names, key)} {value}"]
+
+
+class MetricCounter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
 
-class NG2025Job(Base):
-    __tablename__ = "ng_2025_jobs"
+
+class MetricGauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+
+class MetricHistogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        if key not in self._values:
+            self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts, _, _ = entry = self._values[key]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_value(self, key, value):
+        counts, total, count = value
+        lines = [f"{self.name}_bucket{format_labels(self.label_names, key, [('le', bound)])} {n}"
+                 for bound, n in zip(self.buckets, counts)]
+        lines.append(f"{self.name}_bucket{format_labels(self.label_names, key, [('le', '+Inf')])} {count}")
+        lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {total}")
+        lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(MetricCounter(name, help, labels))
+
+    def gauge(self, name, help, labels=()):
+        return self._register(MetricGauge(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(MetricHistogram(name, help, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+SCRAPE_SECONDS = metrics.histogram("jobbot_scrape_seconds", "get_jobs latency per feed", ["feed"])
+FREELANCER_FETCH_SECONDS = metrics.histogram("jobbot_freelancer_fetch_seconds", "fetch_freelancer_jobs latency")
+FILTER_SECONDS = metrics.histogram("jobbot_filter_seconds", "Title filter time per channel", ["channel"])
+DB_SECONDS = metrics.histogram("jobbot_db_seconds", "Database lookup/commit time", ["operation"])
+DISCORD_SEND_SECONDS = metrics.histogram("jobbot_discord_send_seconds", "Discord send latency", ["channel"])
+ROWS_SCRAPED = metrics.counter("jobbot_rows_scraped_total", "Rows returned by scrapes", ["feed"])
+ROWS_REJECTED = metrics.counter("jobbot_rows_rejected_total", "Rows skipped per channel and reason",
+                                ["channel", "reason"])
+JOBS_POSTED = metrics.counter("jobbot_jobs_posted_total", "Jobs delivered to Discord", ["channel"])
+FEED_ERRORS = metrics.counter("jobbot_feed_errors_total", "Failed feed runs", ["feed"])
+EVENT_LOOP_LAG = metrics.gauge("jobbot_event_loop_lag_seconds", "How late the event loop woke a 1s sleep")
+STARTUP_SECONDS = metrics.gauge("jobbot_startup_seconds", "Seconds from process start until each startup stage was done",
+                                ["stage"])
+
+
+def mark_startup(stage):
+    elapsed = time.perf_counter() - STARTED_AT
+    STARTUP_SECONDS.set(elapsed, stage=stage)
+    return elapsed
+
+
+async def serve_metrics(host=METRICS_HOST, port=METRICS_PORT):
+    async def handle(request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def monitor_event_loop_lag(interval=1.0):
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - started - interval))
+
+
+# --- Database Setup ---
+# WAL lets the reader threads keep querying while the writer commits; NORMAL sync is
+# durable across application crashes and much cheaper than FULL in WAL mode.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",  # KiB, i.e. ~20 MB per connection
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+JOBS_DATABASE_URL = os.getenv('JOBS_DATABASE_URL', 'sqlite:///jobs.db')  # Database for generic job scraper
+FREELANCER_DATABASE_URL = os.getenv('FREELANCER_DATABASE_URL', 'sqlite:///freelancer_jobs.db')  # Database for Freelancer jobs
+
+Base = declarative_base()
+
+# --- Generic Job Model ---
+# Feed keys, one per generic job channel
+FEED_FULL_TIME = "full_time"
+FEED_BLOCKCHAIN = "blockchain"
+FEED_MOBILE = "mobile"
+FEED_MACHINE_LEARNING = "machine_learning"
+FEED_INTERN = "intern"
+FEED_NG_2025 = "ng_2025"
+FEED_NG_2024 = "ng_2024"
+
+# All generic feeds share one table; (feed, job_id) is unique so every dedup lookup is an index probe
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_feed_job_id", "feed", "job_id", unique=True),
+        Index("ix_jobs_posted_at", "posted_at"),
+    )
 
     id = Column(Integer, primary_key=True)
+    feed = Column(String, nullable=False)
+    job_id = Column(String, nullable=False)
     description = Column(String)
-    job_id = Column(String, unique=True)
     application_url = Column(String)
     job_title = Column(String)
     company_name = Column(String)
     company_url = Column(String)
     location = Column(String)
+    posted_at = Column(DateTime, default=datetime.utcnow)
+    fingerprint = Column(Integer)  # job_fingerprint of company/title/location
+    simhash = Column(Integer)  # description_simhash, when enabled
 
-class NG2024Job(Base):
-    __tablename__ = "ng_2024_jobs"
+# Last fully delivered scrape per (site, search_term, location), used to scrape only the gap since then
+class ScrapeState(Base):
+    __tablename__ = "scrape_state"
+    __table_args__ = (Index("ix_scrape_state_query", "site", "search_term", "location", unique=True),)
 
     id = Column(Integer, primary_key=True)
-    description = Column(String)
-    job_id = Column(String)
-    application_url = Column(String)
-    job_title = Column(String)
-    company_name = Column(String)
-    company_url = Column(String)
-    location = Column(String)
+    site = Column(String, nullable=False)
+    search_term = Column(String, nullable=False)
+    location = Column(String, nullable=False)
+    last_success_at = Column(DateTime)
+    last_results_wanted = Column(Integer)
+    last_result_count = Column(Integer)
+
+# Jobs queued by scraper worker processes (FEED_MODE=outbox) for the bot to post. Rows are
+# deleted once their job is recorded as posted, so pending work survives restarts. Rows
+# the bot can't post are dead-lettered: kept with a reason and skipped until it's cleared.
+class OutboxJob(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_channel_key", "channel_id", "key", unique=True),)
 
-# Freelancer-specific database setup
-freelancer_engine = create_engine('sqlite:///freelancer_jobs.db')  # Database for Freelancer jobs
-Base.metadata.create_all(freelancer_engine)
-FreelancerSession = sessionmaker(bind=freelancer_engine)
-#session = FreelancerSession()
+    id = Column(Integer, primary_key=True)
+    channel_id = Column(Integer, nullable=False)
+    source = Column(String, nullable=False)  # table the job is recorded in once posted
+    feed = Column(String, nullable=False)  # seen index the key belongs to
+    key = Column(String, nullable=False)  # job id or link
+    content = Column(String)
+    record = Column(String, nullable=False)  # JSON row for the source table
+    created_at = Column(DateTime, default=datetime.utcnow)
+    dead_letter = Column(String)  # why the bot gave up on it; set back to NULL to retry
+
+# Per-feed tables used before the jobs table existed
+LEGACY_JOB_TABLES = {
+    "full_time_jobs": FEED_FULL_TIME,
+    "blockchain_jobs": FEED_BLOCKCHAIN,
+    "mobile_jobs": FEED_MOBILE,
+    "machin_learning_jobs": FEED_MACHINE_LEARNING,
+    "intern_jobs": FEED_INTERN,
+    "ng_2025_jobs": FEED_NG_2025,
+    "ng_2024_jobs": FEED_NG_2024,
+}
 
 
+# One-shot migration: copies every legacy per-feed table into jobs and drops it,
+# each table in its own transaction. Safe to run on every start.
+def migrate_legacy_job_tables(engine, log):
+    existing = set(inspect(engine).get_table_names())
+    for table, feed in LEGACY_JOB_TABLES.items():
+        if table not in existing:
+            continue
+        with engine.begin() as connection:
+            copied = connection.execute(text(
+                f"INSERT OR IGNORE INTO jobs (feed, job_id, description, application_url, job_title, "
+                f"company_name, company_url, location) "
+                f"SELECT :feed, job_id, description, application_url, job_title, company_name, company_url, location "
+                f"FROM {table} WHERE job_id IS NOT NULL ORDER BY id"
+            ), {"feed": feed}).rowcount
+            connection.execute(text(f"DROP TABLE {table}"))
+        log.info("Migrated %d rows from %s into jobs (feed: %s)", copied, table, feed)
+
+
+# create_all never alters existing tables, so columns and indexes added to a model
+# later are added here. Safe to run on every start.
+def upgrade_table(engine, model, log):
+    inspector = inspect(engine)
+    table = model.__table__
+    columns = {column['name'] for column in inspector.get_columns(table.name)}
+    indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+    with engine.begin() as connection:
+        for column in table.columns:
+            if column.name not in columns:
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"))
+                log.info("Added column %s.%s", table.name, column.name)
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(connection)
+                log.info("Created index %s", index.name)
+
+# Freelancer-specific model, stored in its own database
 class FreelancerJob(Base):
     __tablename__ = 'freelancer_jobs'
 
@@ -170,7 +396,28 @@ class FreelancerJob(Base):
     description = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-Base.metadata.create_all(freelancer_engine)
+
+# Tables each database holds; the rest of Base.metadata belongs to the other one
+JOBS_TABLES = (Job.__table__, ScrapeState.__table__, OutboxJob.__table__)
+FREELANCER_TABLES = (FreelancerJob.__table__,)
+
+
+def create_database_engine(url, tables):
+    engine = create_engine(url)
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    Base.metadata.create_all(engine, tables=tables)
+    return engine
+
+
+# Engines, schema and migrations are set up once at startup, not on import
+def open_databases(log):
+    jobs_engine = create_database_engine(JOBS_DATABASE_URL, JOBS_TABLES)
+    migrate_legacy_job_tables(jobs_engine, log)
+    upgrade_table(jobs_engine, Job, log)
+    upgrade_table(jobs_engine, OutboxJob, log)
+    freelancer_engine = create_database_engine(FREELANCER_DATABASE_URL, FREELANCER_TABLES)
+    return (Database(sessionmaker(bind=jobs_engine), "jobs"),
+            Database(sessionmaker(bind=freelancer_engine), "freelancer"))
 
 # --- Configuration ---
 blacklist_companies = {
@@ -203,21 +450,1195 @@ bad_roles = {
     "III"
 }
 
-quarantined_2025_terms = {
-    '2024',
-    'intern',
-    'internship'
-}
+# --- Title Filters ---
+# Rejection reasons, in the order they are checked
+REJECT_BLACKLISTED = "blacklisted_company"
+REJECT_MISSING_REQUIRED = "missing_required_term"
+REJECT_QUARANTINED = "quarantined_term"
+REJECT_BAD_ROLE = "bad_role"
+REJECT_DUPLICATE = "duplicate"
+REJECT_REPOST = "repost"
+
+
+# Case-insensitive substring match on any of terms, as one alternation
+def compile_terms(terms):
+    terms = sorted({term.lower() for term in terms}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
+# A channel's title rules, compiled once and shared by every scrape routed through it
+class TitleFilter:
+    def __init__(self, required_terms, quarantine_terms=(), bad_terms=bad_roles, companies=blacklist_companies):
+        self.required = compile_terms(required_terms)
+        self.quarantine = compile_terms(quarantine_terms)
+        self.bad_roles = compile_terms(bad_terms)
+        self.companies = frozenset(companies)
+
+    # The first title check a title fails, or None if it passes
+    def title_reason(self, title):
+        title = '' if title is None else str(title)
+        if self.required is not None and not self.required.search(title):
+            return REJECT_MISSING_REQUIRED
+        if self.quarantine is not None and self.quarantine.search(title):
+            return REJECT_QUARANTINED
+        if self.bad_roles is not None and self.bad_roles.search(title):
+            return REJECT_BAD_ROLE
+        return None
+
+    # Returns the jobs that pass, a Counter of rejections per reason and
+    # (job, reason) for each rejected job. The same title is only matched once.
+    def evaluate(self, jobs):
+        kept = []
+        rejected = []
+        counts = Counter()
+        title_reasons = {}
+        for job in jobs:
+            if job.company in self.companies:
+                reason = REJECT_BLACKLISTED
+            elif job.title in title_reasons:
+                reason = title_reasons[job.title]
+            else:
+                reason = title_reasons[job.title] = self.title_reason(job.title)
+            if reason is None:
+                kept.append(job)
+            else:
+                counts[reason] += 1
+                rejected.append((job, reason))
+        return kept, counts, rejected
+
+
+# Scraping runs on a worker pool so the gateway heartbeat never waits on it.
+# SCRAPE_SITE_CONCURRENCY caps how many scrapes hit the same site at once,
+# e.g. "2" for every site or "linkedin=1,indeed=3" per site.
+SCRAPE_MAX_WORKERS = int(os.getenv('SCRAPE_MAX_WORKERS', '4'))
+SCRAPE_SITE_CONCURRENCY = os.getenv('SCRAPE_SITE_CONCURRENCY', '2')
+
+
+def parse_site_concurrency(value, default=2):
+    limits = {}
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            site, limit = part.split('=', 1)
+            limits[site.strip().lower()] = max(1, int(limit))
+        else:
+            default = max(1, int(part))
+    return limits, default
+
+# --- Feed Scheduler ---
+# Each feed polls on its own adaptive interval: faster while it keeps finding new
+# jobs, exponentially slower on empty results, errors and HTTP 429s.
+FEED_INTERVAL = float(os.getenv('FEED_INTERVAL', '60'))
+FEED_MIN_INTERVAL = float(os.getenv('FEED_MIN_INTERVAL', '30'))
+FEED_MAX_INTERVAL = float(os.getenv('FEED_MAX_INTERVAL', '900'))
+FEED_JITTER = 0.1
+# Global cap on feeds scraping at the same time
+SCRAPE_MAX_CONCURRENT = int(os.getenv('SCRAPE_MAX_CONCURRENT', '3'))
+# Comma-separated searches to run (plus "freelancer"); unset runs those enabled in FEEDS_FILE
+ENABLED_FEEDS = os.getenv('ENABLED_FEEDS')
+# "inline" scrapes in the bot process; "outbox" leaves scraping to `python bot.py worker`
+# processes and only posts what they queue
+FEED_MODE = os.getenv('FEED_MODE', 'inline').lower()
+
+
+def is_rate_limited(error):
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    return status == 429 or '429' in str(error)
+
+
+# Follows the posts queued by one feed run until each is recorded or given up on,
+# so the scheduler adapts to what was delivered rather than what was queued. The
+# run holds it too, until routed() says everything it's going to queue is queued.
+class DeliveryTracker:
+    replayed = False  # the run reused another search's scrape instead of scraping
+
+    def __init__(self):
+        self.pending = 1
+        self.delivered = 0
+        self.error = None
+        self.settled = asyncio.get_running_loop().create_future()
+
+    def hold(self):
+        self.pending += 1
+
+    # One queued post recorded, or given up on with `error`
+    def release(self, error=None):
+        if error is None:
+            self.delivered += 1
+        else:
+            self.fail(error)
+        self._settle()
+
+    def routed(self, error=None):
+        if error is not None:
+            self.fail(error)
+        self._settle()
+
+    def fail(self, error):
+        if self.error is None:
+            self.error = error
+            self.on_failed()
+
+    def on_failed(self):
+        pass
+
+    def on_settled(self):
+        pass
+
+    def _settle(self):
+        self.pending -= 1
+        if self.pending == 0 and not self.settled.done():
+            self.settled.set_result(self.delivered)
+            self.on_settled()
+
+
+class FeedSchedule:
+    def __init__(self, name, run, interval=FEED_INTERVAL, min_interval=FEED_MIN_INTERVAL,
+                 max_interval=FEED_MAX_INTERVAL):
+        self.name = name
+        self.run = run
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.runs = 0
+        self.failures = 0
+        self.new_jobs = 0
+
+    def _clamp(self, interval):
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+
+    def record_success(self, new_jobs):
+        self.runs += 1
+        self.new_jobs += new_jobs
+        self._clamp(self.interval / 2 if new_jobs else self.interval * 1.5)
+
+    # A replay of another search's scrape that found nothing new leaves the interval alone
+    def record_skip(self):
+        self.runs += 1
+
+    def record_failure(self, error):
+        self.runs += 1
+        self.failures += 1
+        self._clamp(self.interval * (4 if is_rate_limited(error) else 2))
+
+    def next_delay(self):
+        return self.interval * random.uniform(1 - FEED_JITTER, 1 + FEED_JITTER)
+
+
+class FeedScheduler:
+    def __init__(self, log, wait_ready=None, max_concurrent=SCRAPE_MAX_CONCURRENT):
+        self.log = log
+        self.wait_ready = wait_ready
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.schedules = {}
+        self._tasks = {}
+        self._stopped = asyncio.Event()
+
+    def add(self, schedule):
+        self.schedules[schedule.name] = schedule
+
+    def remove(self, name):
+        self.schedules.pop(name, None)
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+
+    def start(self):
+        self._stopped.clear()
+        for name, schedule in self.schedules.items():
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(self._run_feed(schedule), name=f"feed-{name}")
+
+    def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._stopped.set()
+
+    # Runs until stop(); feeds swapped in or out meanwhile (FEEDS_FILE reloads) don't end it
+    async def join(self):
+        await self._stopped.wait()
+
+    async def _run_feed(self, schedule):
+        if self.wait_ready is not None:
+            await self.wait_ready()
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self.semaphore:
+                    new_jobs = await schedule.run()
+                if isinstance(new_jobs, DeliveryTracker):
+                    # Waited for outside the semaphore; only delivered jobs count as new
+                    tracker = new_jobs
+                    await asyncio.wait_for(asyncio.shield(tracker.settled), schedule.max_interval)
+                    if tracker.error is not None:
+                        raise tracker.error
+                    new_jobs = None if tracker.replayed and not tracker.delivered else tracker.delivered
+                if new_jobs is None:
+                    schedule.record_skip()
+                else:
+                    schedule.record_success(new_jobs)
+                self.log.info("Feed %s: %d new jobs in %.1fs, next run in ~%.0fs",
+                              schedule.name, new_jobs or 0, time.perf_counter() - started, schedule.interval)
+            except Exception as e:
+                FEED_ERRORS.inc(feed=schedule.name)
+                schedule.record_failure(e)
+                self.log.error("Feed %s failed after %.1fs: %r, backing off to ~%.0fs",
+                               schedule.name, time.perf_counter() - started, e, schedule.interval)
+            await asyncio.sleep(schedule.next_delay())
+
+
+# --- Feed Registry ---
+# Channels and searches are read from FEEDS_FILE (JSON) and re-read whenever it changes,
+# so feeds can be added or retuned without a restart.
+FEEDS_FILE = os.getenv('FEEDS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feeds.json'))
+FEEDS_RELOAD_SECONDS = float(os.getenv('FEEDS_RELOAD_SECONDS', '30'))
+
+
+# A channel id given directly, or the name of the environment variable holding it
+def resolve_channel_id(value):
+    if isinstance(value, str) and not value.isdigit():
+        value = os.getenv(value)
+    return int(value) if value else None
+
+
+# One posting channel. Its key is what its jobs are stored and deduplicated under.
+class ChannelFeed:
+    def __init__(self, key, name, channel, required_terms, quarantine_terms=()):
+        self.key = key
+        self.name = name
+        self.channel_id = resolve_channel_id(channel)
+        self.title_filter = TitleFilter(required_terms, quarantine_terms)
+
+
+# One scheduled search, routed through the filters of each of its channels.
+# With several search terms, each run uses the next one. Descriptions are dropped
+# at scrape time unless the search opts in (FINGERPRINT_SIMHASH needs them).
+class SearchFeed:
+    def __init__(self, name, search_terms, channels, sites=('linkedin',), location='United States, Remote',
+                 results_wanted=50, hours_old=24, interval=FEED_INTERVAL, enabled=True, descriptions=False):
+        self.name = name
+        self.search_terms = list(search_terms)
+        self.channels = list(channels)
+        self.sites = list(sites)
+        self.location = location
+        self.results_wanted = results_wanted
+        self.hours_old = hours_old
+        self.interval = interval
+        self.enabled = enabled
+        self.descriptions = descriptions
+        self._next_term = 0
+
+    def next_search_term(self):
+        search_term = self.search_terms[self._next_term % len(self.search_terms)]
+        self._next_term += 1
+        return search_term
+
+
+class FeedRegistry:
+    def __init__(self, channels, searches, freelancer=None, path=None, mtime=None):
+        self.channels = channels
+        self.searches = searches
+        self.path = path
+        self.mtime = mtime
+        freelancer = freelancer or {}
+        self.freelancer_channel_id = resolve_channel_id(freelancer.get('channel', 'FREELANCER_CHANNEL_ID'))
+        self.freelancer_enabled = freelancer.get('enabled', True)
+        # post_jobs resolves its channel with one dict lookup, however many feeds there are
+        self.by_channel_id = {feed.channel_id: feed for feed in channels.values() if feed.channel_id is not None}
+
+    @classmethod
+    def load(cls, path=FEEDS_FILE):
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        channels = {key: ChannelFeed(key, **options) for key, options in config['channels'].items()}
+        searches = {name: SearchFeed(name, **options) for name, options in config.get('searches', {}).items()}
+        for search in searches.values():
+            unknown = set(search.channels) - set(channels)
+            if unknown:
+                raise ValueError(f"search {search.name} routes to unknown channels: {', '.join(sorted(unknown))}")
+        return cls(channels, searches, config.get('freelancer'), path, mtime)
+
+    def changed(self):
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except OSError:
+            return False
+
+    # Feeds to schedule: an explicit comma-separated list, else everything enabled in the file
+    def enabled(self, names=None):
+        if names:
+            return {name.strip() for name in names.split(',') if name.strip()}
+        enabled = {name for name, search in self.searches.items() if search.enabled}
+        if self.freelancer_enabled:
+            enabled.add('freelancer')
+        return enabled
+
+    def channel_ids(self, keys):
+        return [self.channels[key].channel_id for key in keys if self.channels[key].channel_id is not None]
+
+
+# --- Freelancer Fetcher ---
+# lxml is much faster than html.parser; fall back if it isn't installed
+FREELANCER_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+# While parsing, the strainer sees the raw class attribute ("JobSearchCard-item ..."), not a list
+def is_job_card_class(value):
+    return value is not None and 'JobSearchCard-item' in (value.split() if isinstance(value, str) else value)
+
+
+# Only build a tree for the job cards, not the whole page
+@functools.lru_cache(maxsize=None)
+def freelancer_card_strainer():
+    from bs4 import SoupStrainer
+    return SoupStrainer('div', class_=is_job_card_class)
+
+
+def parse_freelancer_jobs(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, FREELANCER_PARSER, parse_only=freelancer_card_strainer())
+    new_jobs = []
+    for job in soup.find_all('div', class_='JobSearchCard-item'):
+        title_element = job.find('a', class_='JobSearchCard-primary-heading-link')
+        title = title_element.text.strip() if title_element else "No Title"
+        link = f"https://www.freelancer.com{title_element['href']}" if title_element else "No Link"
+        description_element = job.find('p', class_='JobSearchCard-primary-description')
+        description = description_element.text.strip() if description_element else "No Description"
+        new_jobs.append((title, link, description))
+    return new_jobs
+
+
+def freelancer_embed(title, link, description):
+    embed = discord.Embed(title=title, url=link, description=description, color=0x00ff00)
+    embed.set_footer(text="Freelancer Job Alert")
+    return embed
+
+
+# Keep-alive HTTP client for the Freelancer listing. Sends conditional requests and
+# returns None when the page is unchanged (304 or same body hash) so callers can skip parsing.
+class FreelancerFetcher:
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def _client(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=120),
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; linkedin_job_alert)'},
+            )
+        return self._session
+
+    async def fetch(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        async with self._client().get(self.url, headers=headers) as response:
+            if response.status == 304:
+                self.not_modified += 1
+                return None
+            response.raise_for_status()
+            body = await response.read()
+            self.etag = response.headers.get('ETag')
+            self.last_modified = response.headers.get('Last-Modified')
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if body_hash == self.body_hash:
+            self.unchanged += 1
+            return None
+        self.body_hash = body_hash
+        return body
+
+    # Forget the last response so the next fetch is parsed even if the page didn't change
+    def reset(self):
+        self.etag = self.last_modified = self.body_hash = None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+# --- Job Records ---
+# Scrapes are projected down to the columns the pipeline reads as soon as they come
+# back, so the full jobspy DataFrame (dozens of columns, long descriptions) is freed
+# on the scrape thread instead of being cached and routed.
+JobRecord = namedtuple('JobRecord', 'id site title company company_url job_url location description')
+
+
+# Descriptions are only kept for feeds that ask for them (e.g. for SimHash)
+def job_records(jobs, descriptions=False):
+    columns = list(JobRecord._fields if descriptions else JobRecord._fields[:-1])
+    projected = jobs.reindex(columns=columns).astype(object)
+    projected = projected.where(projected.notna(), None)
+    if descriptions:
+        return [JobRecord._make(row) for row in projected.itertuples(index=False, name=None)]
+    return [JobRecord(*row, None) for row in projected.itertuples(index=False, name=None)]
+
+
+def scrape_job_records(descriptions=False, **kwargs):
+    from jobspy import scrape_jobs
+    return job_records(scrape_jobs(**kwargs), descriptions)
+
+
+# --- Scrape Cache ---
+# How long a scrape result can be reused by identical or narrower queries
+SCRAPE_CACHE_TTL = float(os.getenv('SCRAPE_CACHE_TTL', '300'))
+
+ScrapeKey = namedtuple('ScrapeKey', 'sites search_term location hours_old results_wanted descriptions')
+
+
+# TTL cache of scrape results. A query is served from any live entry for the same
+# sites/search term/location that looked back at least as far, fetched at least
+# as many results and kept descriptions if it needs them, and concurrent identical
+# queries share one in-flight scrape. Entries are only reused by other owners
+# (searches): a feed's next run always scrapes afresh rather than replaying its own.
+class ScrapeCache:
+    def __init__(self, ttl=SCRAPE_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key, owner):
+        now = time.monotonic()
+        for cached_key, (expires, cached_owner, jobs) in list(self._entries.items()):
+            if expires <= now:
+                del self._entries[cached_key]
+            elif owner is not None and cached_owner == owner:
+                continue
+            elif (cached_key[:3] == key[:3] and cached_key.hours_old >= key.hours_old
+                  and cached_key.results_wanted >= key.results_wanted
+                  and cached_key.descriptions >= key.descriptions):
+                return jobs
+        return None
+
+    # Returns (result, replayed); replayed results come from an earlier, finished scrape
+    async def get(self, key, fetch, owner=None):
+        if self.ttl <= 0:
+            return await fetch(), False
+        jobs = self._lookup(key, owner)
+        if jobs is not None:
+            self.hits += 1
+            return jobs, True
+        if key in self._inflight:
+            self.hits += 1
+            return await asyncio.shield(self._inflight[key]), False
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            jobs = await future
+        finally:
+            del self._inflight[key]
+        self._entries[key] = (time.monotonic() + self.ttl, owner, jobs)
+        return jobs, False
+
+
+# --- Incremental Scraping ---
+# Scrapes only look back over the gap since the last successful run (plus some
+# overlap) and ask for proportionally fewer results, down to these floors.
+INCREMENTAL_OVERLAP_HOURS = float(os.getenv('INCREMENTAL_OVERLAP_HOURS', '0.5'))
+INCREMENTAL_MIN_RESULTS = int(os.getenv('INCREMENTAL_MIN_RESULTS', '10'))
+
+
+def load_scrape_states(session, sites, search_term, location):
+    rows = session.query(ScrapeState).filter(
+        ScrapeState.site.in_(list(sites)),
+        ScrapeState.search_term == search_term,
+        ScrapeState.location == location,
+    ).all()
+    return {row.site: row for row in rows}
+
+
+# Narrows hours_old/results_wanted to the gap since the last successful scrape of
+# every site in the query. Falls back to the full window on first run or after downtime.
+def incremental_window(states, sites, hours_old, results_wanted, now):
+    if any(site not in states or states[site].last_success_at is None for site in sites):
+        return hours_old, results_wanted
+    gap_hours = max((now - states[site].last_success_at).total_seconds() / 3600 for site in sites)
+    hours = math.ceil(gap_hours + INCREMENTAL_OVERLAP_HOURS)
+    if hours >= hours_old:
+        return hours_old, results_wanted
+    results = max(INCREMENTAL_MIN_RESULTS, math.ceil(results_wanted * hours / hours_old))
+    # A scrape that came back full may have missed postings, so ask for more next time
+    for site in sites:
+        state = states[site]
+        if state.last_results_wanted and state.last_result_count is not None \
+                and state.last_result_count >= state.last_results_wanted:
+            results = max(results, state.last_results_wanted * 2)
+    return max(hours, 1), min(results, results_wanted)
+
+
+def save_scrape_states(session, sites, search_term, location, started_at, results_wanted, jobs):
+    rows = [dict(site=site, search_term=search_term, location=location, last_success_at=started_at,
+                 last_results_wanted=results_wanted,
+                 last_result_count=sum(1 for job in jobs if job.site in (site, None)))
+            for site in sites]
+    statement = sqlite_insert(ScrapeState)
+    statement = statement.on_conflict_do_update(
+        index_elements=['site', 'search_term', 'location'],
+        set_={
+            'last_success_at': statement.excluded.last_success_at,
+            'last_results_wanted': statement.excluded.last_results_wanted,
+            'last_result_count': statement.excluded.last_result_count,
+        },
+    )
+    session.execute(statement, rows)
+
+
+# Winds last_success_at back to where a scrape started from (cleared if it had none), never forwards
+def rewind_scrape_states(session, sites, search_term, location, previous):
+    for site in sites:
+        session.execute(update(ScrapeState).where(
+            ScrapeState.site == site, ScrapeState.search_term == search_term, ScrapeState.location == location,
+        ).values(last_success_at=func.min(ScrapeState.last_success_at, previous.get(site))))
+
+
+# One finished scrape: what save_scrape_states needs, the last_success_at per site it
+# started from, and when it ran (monotonic)
+ScrapeRun = namedtuple('ScrapeRun', 'sites search_term location started_at results_wanted jobs previous scraped_at')
+
+
+# Saves a scrape's state only once every job routed from it has been recorded (or
+# written to the outbox), so the window never narrows past an undelivered job. If
+# one can't be delivered the state is wound back instead, and scrapes of the same
+# query that started before the failure don't save theirs either: they may have
+# skipped the job as already seen. Each routing of a (possibly cached) scrape gets
+# its own checkpoint, which is also the feed run's DeliveryTracker.
+class ScrapeCheckpoint(DeliveryTracker):
+    def __init__(self, database, failures, run, replayed=False):
+        super().__init__()
+        self.database = database
+        self.failures = failures  # query -> monotonic time of its last undelivered job
+        self.run = run
+        self.query = (tuple(sorted(run.sites)), run.search_term, run.location)
+        self.replayed = replayed
+
+    def on_settled(self):
+        if self.error is None and self.failures.get(self.query, 0) < self.run.scraped_at:
+            run = self.run
+            self.database.submit(save_scrape_states, run.sites, run.search_term, run.location,
+                                 run.started_at, run.results_wanted, run.jobs)
+
+    def on_failed(self):
+        self.failures[self.query] = time.monotonic()
+        self.database.submit(rewind_scrape_states, self.run.sites, self.run.search_term, self.run.location,
+                             self.run.previous)
+
+
+# --- Persistence Helpers ---
+SQLITE_MAX_VARIABLES = 900  # stay under SQLite's default limit of 999 bound parameters
+# Most writes queued at once that the writer folds into one commit
+DB_WRITE_GROUP_SIZE = int(os.getenv('DB_WRITE_GROUP_SIZE', '100'))
+
+
+# What a Database.submit future failed with, or None if the write succeeded
+def write_error(future):
+    if future.cancelled():
+        return RuntimeError("write cancelled")
+    return future.exception()
+
+
+def write_succeeded(future):
+    return write_error(future) is None
+
+
+def chunked(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# Returns the subset of values already stored in column, optionally narrowed by extra criteria
+def existing_values(session, column, values, *criteria):
+    values = list(dict.fromkeys(v for v in values if v is not None))
+    found = set()
+    with DB_SECONDS.time(operation="lookup"):
+        for chunk in chunked(values, SQLITE_MAX_VARIABLES):
+            found.update(v for (v,) in session.query(column).filter(column.in_(chunk), *criteria))
+    return found
+
+
+# Inserts rows in one statement, skipping rows that hit a unique constraint
+def insert_ignore(session, model, rows):
+    if rows:
+        session.execute(sqlite_insert(model.__table__).on_conflict_do_nothing(), rows)
+
+
+# Runs database work off the event loop. Reads go to a small pool of reader threads,
+# each with its own session (WAL lets them run while a write is in progress). Writes go
+# to one long-lived writer thread that groups whatever is queued into a single commit.
+class Database:
+    def __init__(self, session_factory, name, readers=2, max_group=DB_WRITE_GROUP_SIZE):
+        self.session_factory = session_factory
+        self.name = name
+        self.max_group = max_group
+        self.log = logger
+        self._writes = SimpleQueue()
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix=f"{name}-read")
+        self._reader_sessions = threading.local()
+        self._writer = threading.Thread(target=self._write_loop, name=f"{name}-writer", daemon=True)
+        self._writer.start()
+
+    def _reader_session(self):
+        session = getattr(self._reader_sessions, 'session', None)
+        if session is None:
+            session = self._reader_sessions.session = self.session_factory()
+        return session
+
+    def _read(self, fn, args):
+        session = self._reader_session()
+        try:
+            return fn(session, *args)
+        finally:
+            # End the read transaction so it doesn't hold back WAL checkpoints
+            session.rollback()
+
+    async def read(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._readers, self._read, fn, args)
+
+    # Queues fn(session, *args) for the writer and returns a future for its result.
+    # alone=True runs it by itself instead of folding it into a group with other writes.
+    def submit(self, fn, *args, alone=False):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # The writer already logs failures; don't also warn about unretrieved exceptions
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._writes.put((fn, args, loop, future, alone))
+        return future
+
+    async def write(self, fn, *args, alone=False):
+        return await self.submit(fn, *args, alone=alone)
+
+    @staticmethod
+    def _resolve(loop, future, result=None, error=None):
+        def resolve():
+            if future.cancelled():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        loop.call_soon_threadsafe(resolve)
+
+    def _write_loop(self):
+        session = self.session_factory()
+        held = None  # a lone write taken off the queue while filling a group
+        try:
+            while True:
+                item = held if held is not None else self._writes.get()
+                held = None
+                if item is None:
+                    return
+                group = [item]
+                while not item[4] and len(group) < self.max_group and not self._writes.empty():
+                    item = self._writes.get()
+                    if item is None:
+                        self._writes.put(None)  # finish this group first, then stop
+                        break
+                    if item[4]:
+                        held = item  # commit this group first, then run it by itself
+                        break
+                    group.append(item)
+                self._run_group(session, group)
+        finally:
+            session.close()
+
+    def _run_group(self, session, group):
+        results = []
+        try:
+            with DB_SECONDS.time(operation="commit"):
+                for fn, args, _, _, _ in group:
+                    results.append(fn(session, *args))
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            if len(group) == 1:
+                fn, _, loop, future, _ = group[0]
+                self.log.error("%s write %s failed: %r", self.name, getattr(fn, '__name__', fn), e)
+                self._resolve(loop, future, error=e)
+                return
+            # Replay one at a time so a single bad write doesn't fail the whole group
+            for item in group:
+                self._run_group(session, [item])
+            return
+        for (_, _, loop, future, _), result in zip(group, results):
+            self._resolve(loop, future, result)
+
+    async def close(self):
+        self._writes.put(None)
+        await asyncio.to_thread(self._writer.join)
+        self._readers.shutdown(wait=True)
+
+
+# --- Seen-ID Index ---
+# Size of each per-feed in-memory index of already posted job ids / links
+SEEN_INDEX_SIZE = int(os.getenv('SEEN_INDEX_SIZE', '50000'))
+
+
+# Exact, size-bounded LRU set in front of the database. Only values missing from
+# here need a database lookup; hit/miss counters tell us whether it's big enough.
+class SeenIndex:
+    def __init__(self, name, max_size=SEEN_INDEX_SIZE):
+        self.name = name
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, value):
+        return value in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, value):
+        if value in self._items:
+            self._items.move_to_end(value)
+            return
+        self._items[value] = None
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def discard(self, value):
+        self._items.pop(value, None)
+
+    # Returns the values not in the index, counting hits and misses
+    def unseen(self, values):
+        missing = []
+        for value in values:
+            if value in self._items:
+                self._items.move_to_end(value)
+                self.hits += 1
+            else:
+                self.misses += 1
+                missing.append(value)
+        return missing
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Returns the newest `limit` values of column, oldest first so they are evicted first
+def newest_values(session, model, column, limit, *criteria):
+    rows = session.query(column).filter(*criteria).order_by(model.id.desc()).limit(limit).all()
+    return [value for (value,) in reversed(rows)]
+
+
+# --- Repost Fingerprints ---
+# Catches the same posting under a new job id (reposts) or, optionally, in another
+# channel, by hashing its normalized company, title and location. SimHash over the
+# description can also catch near-identical rewordings from the same company.
+FINGERPRINT_WINDOW_DAYS = float(os.getenv('FINGERPRINT_WINDOW_DAYS', '14'))  # 0 disables
+SUPPRESS_CROSS_CHANNEL_DUPLICATES = os.getenv('SUPPRESS_CROSS_CHANNEL_DUPLICATES', 'false').lower() in ('1', 'true', 'yes')
+FINGERPRINT_SIMHASH = os.getenv('FINGERPRINT_SIMHASH', 'false').lower() in ('1', 'true', 'yes')
+SIMHASH_MAX_DISTANCE = int(os.getenv('SIMHASH_MAX_DISTANCE', '3'))
+SIMHASH_BANDS = 4  # 16-bit bands; any two hashes within 3 bits agree on at least one
+COMPANY_SUFFIXES = frozenset({'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'gmbh', 'plc'})
+UINT64_MASK = (1 << 64) - 1
+
+
+def normalize_field(value):
+    if not isinstance(value, str):
+        return ""
+    return " ".join(re.findall(r"[a-z0-9]+", value.casefold()))
+
+
+def normalize_company(value):
+    words = normalize_field(value).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+# Signed 64-bit, so it fits an SQLite INTEGER
+def job_fingerprint(company, title, location):
+    key = "\x1f".join((normalize_company(company), normalize_field(title), normalize_field(location)))
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big', signed=True)
+
+
+# 64-bit SimHash of word trigrams, or None for descriptions too short to compare.
+# Signed like job_fingerprint; the index works on the unsigned value.
+@functools.lru_cache(maxsize=4096)
+def description_simhash(text):
+    words = re.findall(r"[a-z0-9]+", text.casefold()) if isinstance(text, str) else []
+    shingles = [" ".join(words[i:i + 3]) for i in range(len(words) - 2)]
+    if len(shingles) < 8:
+        return None
+    import numpy as np
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+                          for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, 64).sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big', signed=True)
+
+
+# Fingerprints posted within the window, by feed. Exact fingerprints are one dict
+# probe; SimHashes are bucketed by 16-bit band so a lookup only compares the few
+# hashes sharing a band with it.
+class FingerprintIndex:
+    def __init__(self, window_days=FINGERPRINT_WINDOW_DAYS, cross_channel=SUPPRESS_CROSS_CHANNEL_DUPLICATES,
+                 max_distance=SIMHASH_MAX_DISTANCE):
+        self.window = timedelta(days=window_days)
+        self.cross_channel = cross_channel
+        self.max_distance = max_distance
+        self._seen = OrderedDict()  # (fingerprint, feed) -> seen at, oldest first
+        self._feeds = defaultdict(set)  # fingerprint -> feeds
+        self._simhashes = OrderedDict()  # (simhash, company, feed) -> seen at, oldest first
+        self._bands = defaultdict(set)  # (band, bits) -> {(simhash, company, feed)}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    @staticmethod
+    def _band_keys(simhash):
+        return [(band, (simhash >> (16 * band)) & 0xFFFF) for band in range(SIMHASH_BANDS)]
+
+    def _expire(self, now):
+        cutoff = now - self.window
+        while self._seen:
+            (fingerprint, feed), seen_at = next(iter(self._seen.items()))
+            if seen_at >= cutoff:
+                break
+            self.discard(fingerprint, feed)
+        while self._simhashes:
+            key, seen_at = next(iter(self._simhashes.items()))
+            if seen_at >= cutoff:
+                break
+            self._discard_simhash(key)
+
+    def _discard_simhash(self, key):
+        if self._simhashes.pop(key, None) is not None:
+            for band_key in self._band_keys(key[0]):
+                self._bands[band_key].discard(key)
+                if not self._bands[band_key]:
+                    del self._bands[band_key]
+
+    def add(self, fingerprint, feed, simhash=None, company=None, seen_at=None):
+        seen_at = seen_at or datetime.utcnow()
+        self._seen.pop((fingerprint, feed), None)
+        self._seen[fingerprint, feed] = seen_at
+        self._feeds[fingerprint].add(feed)
+        if simhash is not None:
+            key = (simhash & UINT64_MASK, company, feed)
+            self._discard_simhash(key)
+            self._simhashes[key] = seen_at
+            for band_key in self._band_keys(key[0]):
+                self._bands[band_key].add(key)
+
+    def discard(self, fingerprint, feed):
+        if self._seen.pop((fingerprint, feed), None) is not None:
+            feeds = self._feeds[fingerprint]
+            feeds.discard(feed)
+            if not feeds:
+                del self._feeds[fingerprint]
+
+    def match(self, fingerprint, feed, simhash=None, company=None):
+        self._expire(datetime.utcnow())
+        feeds = self._feeds.get(fingerprint, ())
+        found = bool(feeds) if self.cross_channel else feed in feeds
+        if not found and simhash is not None:
+            simhash &= UINT64_MASK
+            found = any(
+                other_company == company and (self.cross_channel or other_feed == feed)
+                and bin(other ^ simhash).count('1') <= self.max_distance
+                for band_key in self._band_keys(simhash)
+                for other, other_company, other_feed in self._bands.get(band_key, ())
+            )
+        self.hits += found
+        return found
+
+
+def recent_fingerprints(session, since):
+    return session.query(Job.fingerprint, Job.simhash, Job.company_name, Job.feed, Job.posted_at).filter(
+        Job.posted_at >= since, Job.fingerprint.isnot(None)).order_by(Job.posted_at).all()
+
+
+# --- Maintenance ---
+# Days to keep posted jobs, overridable per feed with RETENTION_DAYS_<FEED> (e.g.
+# RETENTION_DAYS_FREELANCER=14). 0 keeps rows forever. Keep this well above the
+# scrape lookback, or pruned jobs could be posted again.
+RETENTION_DAYS = float(os.getenv('RETENTION_DAYS', '90'))
+# Descriptions are only needed while a post is fresh; older rows keep the rest of their columns
+DESCRIPTION_RETENTION_DAYS = float(os.getenv('DESCRIPTION_RETENTION_DAYS', '7'))
+MAINTENANCE_INTERVAL_HOURS = float(os.getenv('MAINTENANCE_INTERVAL_HOURS', '6'))
+MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', '1000'))
+# Full VACUUM when this share of the file is free pages; otherwise incremental vacuum
+VACUUM_FREE_RATIO = float(os.getenv('VACUUM_FREE_RATIO', '0.2'))
+
+
+def retention_days(feed):
+    return float(os.getenv(f'RETENTION_DAYS_{feed.upper()}', RETENTION_DAYS))
+
+
+def database_stats(session, models):
+    page_size = session.execute(text("PRAGMA page_size")).scalar()
+    page_count = session.execute(text("PRAGMA page_count")).scalar()
+    return {
+        'size_bytes': page_size * page_count,
+        'rows': {model.__tablename__: session.query(func.count(model.id)).scalar() for model in models},
+    }
+
+
+# Rows migrated from the legacy tables have no timestamp; start their retention clock now
+def stamp_undated_rows(session, model, date_column, now):
+    return session.execute(update(model).where(date_column.is_(None)).values({date_column: now})).rowcount
+
+
+# Deletes at most limit rows older than cutoff; callers repeat until it returns less than limit
+def prune_rows(session, model, date_column, cutoff, limit, *criteria):
+    oldest = select(model.id).where(date_column < cutoff, *criteria).order_by(model.id).limit(limit)
+    return session.execute(delete(model).where(model.id.in_(oldest.scalar_subquery()))).rowcount
+
+
+def trim_descriptions(session, model, date_column, cutoff):
+    return session.execute(update(model).where(date_column < cutoff, model.description.isnot(None))
+                           .values(description=None)).rowcount
+
+
+# Refreshes planner statistics and hands free pages back to the filesystem. The first
+# full VACUUM also switches the file to incremental auto-vacuum, after which the cheap
+# incremental pass is enough unless a large share of the file has gone free.
+# Submitted with alone=True: VACUUM can't run inside a transaction, so this must
+# not share a commit with other writes
+def compact_database(session):
+    with session.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+        incremental = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        page_count = connection.exec_driver_sql("PRAGMA page_count").scalar()
+        free_pages = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if incremental and free_pages < page_count * VACUUM_FREE_RATIO:
+            connection.exec_driver_sql("PRAGMA incremental_vacuum")
+            return "incremental vacuum"
+        connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+        connection.exec_driver_sql("ANALYZE")
+        return "vacuum"
+
+
+# --- Outbound Discord Queue ---
+DISCORD_MESSAGE_LIMIT = 2000
+DISCORD_EMBED_LIMIT = 10
+DISCORD_EMBED_CHARACTER_LIMIT = 6000  # combined across all embeds in a message
+# Per-channel send budget: at most SEND_BUCKET_SIZE messages every SEND_BUCKET_SECONDS
+SEND_BUCKET_SIZE = int(os.getenv('SEND_BUCKET_SIZE', '5'))
+SEND_BUCKET_SECONDS = float(os.getenv('SEND_BUCKET_SECONDS', '5'))
+# How long a worker waits for more jobs to pack into the same message
+SEND_COALESCE_SECONDS = float(os.getenv('SEND_COALESCE_SECONDS', '1'))
+SEND_MAX_ATTEMPTS = 3
+
+
+# One job (or other post) waiting to go out. `record` is a (model, row) pair that is
+# persisted once the message carrying it has been delivered; `seen` is the
+# (seen index, value) pair to forget again if it can't be delivered; `tracker` is
+# the DeliveryTracker of the feed run that queued it.
+class OutboundItem:
+    __slots__ = ('content', 'embed', 'record', 'seen', 'outbox_id', 'tracker')
+
+    def __init__(self, content=None, embed=None, record=None, seen=None, outbox_id=None, tracker=None):
+        self.content = content
+        self.embed = embed
+        self.record = record
+        self.seen = seen
+        self.outbox_id = outbox_id
+        self.tracker = tracker
+
+
+# Per-channel send queue. A background worker drains it, packing text items into
+# one block-quoted message up to Discord's 2000 characters (or up to 10 embeds) and
+# keeping to the channel's send budget, so producers never wait on Discord.
+class ChannelSendQueue:
+    def __init__(self, channel, on_delivered, on_failed, log, text_prefix=">>> "):
+        self.channel = channel
+        self.on_delivered = on_delivered
+        self.on_failed = on_failed
+        self.log = log
+        self.text_prefix = text_prefix
+        self._pending = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._sent_at = deque(maxlen=SEND_BUCKET_SIZE)
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, item):
+        self._pending.append(item)
+        self._idle.clear()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._worker(), name=f"send-queue-{self.channel.id}")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    # Waits until everything queued so far has been sent (or given up on)
+    async def join(self):
+        await self._idle.wait()
+
+    def _next_batch(self):
+        first = self._pending.popleft()
+        batch = [first]
+        if first.embed is not None:
+            length = len(first.embed)
+            while self._pending and self._pending[0].embed is not None and len(batch) < DISCORD_EMBED_LIMIT:
+                extra = len(self._pending[0].embed)
+                if length + extra > DISCORD_EMBED_CHARACTER_LIMIT:
+                    break
+                length += extra
+                batch.append(self._pending.popleft())
+            return batch
+        length = len(self.text_prefix) + len(first.content)
+        while self._pending and self._pending[0].embed is None:
+            extra = len(self._pending[0].content) + 2
+            if length + extra > DISCORD_MESSAGE_LIMIT:
+                break
+            length += extra
+            batch.append(self._pending.popleft())
+        return batch
+
+    async def _wait_for_budget(self):
+        if len(self._sent_at) == self._sent_at.maxlen:
+            delay = self._sent_at[0] + SEND_BUCKET_SECONDS - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _send(self, batch):
+        if batch[0].embed is not None:
+            kwargs = {'embeds': [item.embed for item in batch]}
+        else:
+            content = self.text_prefix + "\n\n".join(item.content for item in batch)
+            kwargs = {'content': content[:DISCORD_MESSAGE_LIMIT]}
+        for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+            await self._wait_for_budget()
+            self._sent_at.append(time.monotonic())
+            try:
+                with DISCORD_SEND_SECONDS.time(channel=self.channel.id):
+                    await self.channel.send(**kwargs)
+                return True
+            except discord.HTTPException as e:
+                retry_after = getattr(e, 'retry_after', None) or 2 ** attempt
+                self.log.warning("Send to channel %s failed (attempt %d/%d): %s",
+                                 self.channel.id, attempt, SEND_MAX_ATTEMPTS, e)
+                if attempt < SEND_MAX_ATTEMPTS:
+                    await asyncio.sleep(retry_after)
+        return False
+
+    async def _worker(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            # Give the rest of a burst a moment to arrive so it shares a message
+            await asyncio.sleep(SEND_COALESCE_SECONDS)
+            while self._pending:
+                batch = self._next_batch()
+                try:
+                    delivered = await self._send(batch)
+                except Exception as e:
+                    self.log.error("Unexpected error sending to channel %s: %r", self.channel.id, e)
+                    delivered = False
+                if delivered:
+                    JOBS_POSTED.inc(len(batch), channel=self.channel.id)
+                callback = self.on_delivered if delivered else self.on_failed
+                try:
+                    callback(batch)
+                except Exception as e:
+                    self.log.error("Send queue callback failed for channel %s: %r", self.channel.id, e)
+            self._idle.set()
+
+
+# --- Outbox ---
+OUTBOX_POLL_SECONDS = float(os.getenv('OUTBOX_POLL_SECONDS', '2'))
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
 
-quarantined_2024_terms = {
-    '2025',
-    'intern',
-    'internship'
+# Table name -> (model, dedup column, timestamp column) for every kind of outbox job
+OUTBOX_SOURCES = {
+    Job.__tablename__: (Job, Job.job_id, Job.posted_at),
+    FreelancerJob.__tablename__: (FreelancerJob, FreelancerJob.link, FreelancerJob.created_at),
 }
 
+
+def outbox_after(session, after_id, limit):
+    statement = select(OutboxJob.__table__).where(
+        OutboxJob.id > after_id, OutboxJob.dead_letter.is_(None)).order_by(OutboxJob.id).limit(limit)
+    return [dict(row) for row in session.execute(statement).mappings()]
+
+
+def dead_letter_outbox_rows(session, ids, reason):
+    for chunk in chunked(ids, SQLITE_MAX_VARIABLES):
+        session.execute(update(OutboxJob).where(OutboxJob.id.in_(chunk)).values(dead_letter=reason))
+
+
+def delete_outbox_rows(session, ids):
+    for chunk in chunked(ids, SQLITE_MAX_VARIABLES):
+        session.execute(delete(OutboxJob).where(OutboxJob.id.in_(chunk)))
+
+
+# Stands in for a channel's send queue in worker processes: queued posts are written
+# to the outbox for the bot process to deliver. Posts whose write fails are handed to
+# on_failed, like undeliverable posts from a send queue.
+class OutboxWriter:
+    def __init__(self, database, channel_id, on_failed):
+        self.database = database
+        self.channel_id = channel_id
+        self.on_failed = on_failed
+
+    def put(self, item):
+        model, record = item.record
+        index, key = item.seen
+        # Timestamps are set again when the bot picks the job up
+        record = {name: value for name, value in record.items() if not isinstance(value, datetime)}
+        future = self.database.submit(insert_ignore, OutboxJob, [dict(
+            channel_id=self.channel_id, source=model.__tablename__, feed=index.name, key=key,
+            content=item.content, record=json.dumps(record),
+        )])
+        future.add_done_callback(functools.partial(self._written, item))
+
+    def _written(self, item, future):
+        if not write_succeeded(future):
+            self.on_failed([item])
+        elif item.tracker is not None:
+            item.tracker.release()
+
+
 # --- Discord Bot Class ---
 class CombinedJobBot(commands.Bot):
-    def __init__(self, generic_session=None, freelancer_session=None) -> None:
+    def __init__(self, jobs_db, freelancer_db, worker=False) -> None:
         intents = discord.Intents.default()
         intents.messages = True
         super().__init__(
@@ -226,28 +1647,193 @@ class CombinedJobBot(commands.Bot):
             help_command=None,
         )
         self.logger = logger
-        self.generic_session = generic_session # session for jobspy
-        self.freelancer_session = freelancer_session # session for freelancer
-        # NG 2024 & 2025 search terms
-        self.ng_2024_search_terms = [
-            "new grad software engineer",
-            "recent graduate software engineer",
-            "junior software engineer"
-        ]
-        self.ng_2024_search_index = 0
-
-        self.ng_2025_search_terms = [
-            "2025 software engineer",
-            "new grad 2025 software engineer",
-            "software engineer recent graduate 2025",
-            "2025 Data Scientist",
-            "2025 Data Analyst",
-            "2025 Data Engineer"
-        ]
-        self.ng_2025_search_index = 0
+        self.jobs_db = jobs_db # database for jobspy
+        self.freelancer_db = freelancer_db # database for freelancer
+        # Channels and searches, swapped out whole when FEEDS_FILE changes
+        self.feeds = FeedRegistry.load()
+        self.feed_names = ENABLED_FEEDS
+        self.scraping = False
 
         #Freelancer URL
         self.freelancer_url = 'https://www.freelancer.com/jobs/?fixed=true&hourly=true&languages=en'
+        self.freelancer_fetcher = FreelancerFetcher(self.freelancer_url)
+
+        # Scrape executor, shared by jobspy and Freelancer fetches
+        self.scrape_executor = ThreadPoolExecutor(max_workers=SCRAPE_MAX_WORKERS, thread_name_prefix="scrape")
+        self.site_limits, self.default_site_limit = parse_site_concurrency(SCRAPE_SITE_CONCURRENCY)
+        self.site_semaphores = {}
+
+        # In-memory seen-ID indexes, keyed by table name
+        self.seen_indexes = {}
+        # Recently posted (company, title, location) fingerprints, for repost suppression
+        self.fingerprints = FingerprintIndex()
+        # Outbound Discord queues, keyed by channel id
+        self.send_queues = {}
+        self.scrape_cache = ScrapeCache()
+        # Worker processes never connect to Discord, so their feeds start right away
+        self.worker = worker
+        self.scheduler = FeedScheduler(self.logger, wait_ready=None if worker else self.wait_until_ready)
+        self.outbox_writers = {}
+        # Outbox rows already handed to a send queue, and the last row id read
+        self.outbox_inflight = set()
+        self.outbox_cursor = 0
+        # Outbox rows delivered but not recorded: id -> (model, record) to record again
+        self.outbox_unrecorded = {}
+        # Per query, when a job scraped for it last went undelivered (see ScrapeCheckpoint)
+        self.scrape_failures = {}
+        self.metrics_runner = None
+        self.loop_lag_task = None
+        self.startup_task = None
+        self.startup_failed = False
+        self.shutdown_task = None
+        self.connected = False
+
+    def site_semaphore(self, site):
+        site = site.lower()
+        if site not in self.site_semaphores:
+            self.site_semaphores[site] = asyncio.Semaphore(self.site_limits.get(site, self.default_site_limit))
+        return self.site_semaphores[site]
+
+    async def run_scrape(self, sites, func, *args, **kwargs):
+        # Acquire site slots in a fixed order so multi-site scrapes can't deadlock each other
+        semaphores = [self.site_semaphore(site) for site in sorted(set(sites))]
+        for semaphore in semaphores:
+            await semaphore.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.scrape_executor, functools.partial(func, *args, **kwargs))
+        finally:
+            for semaphore in reversed(semaphores):
+                semaphore.release()
+
+    def send_queue(self, channel):
+        if channel.id not in self.send_queues:
+            self.send_queues[channel.id] = ChannelSendQueue(
+                channel, self.on_jobs_delivered, self.on_jobs_failed, self.logger)
+        return self.send_queues[channel.id]
+
+    # Where a channel's posts go: its send queue, or the outbox when running as a worker
+    def post_target(self, channel_id):
+        if self.worker:
+            if channel_id not in self.outbox_writers:
+                self.outbox_writers[channel_id] = OutboxWriter(self.jobs_db, channel_id, self.on_jobs_failed)
+            return self.outbox_writers[channel_id]
+        channel = self.get_channel(channel_id)
+        return None if channel is None else self.send_queue(channel)
+
+    def database_for(self, model):
+        return self.freelancer_db if model is FreelancerJob else self.jobs_db
+
+    # Queues delivered jobs for the database writers, which group them into shared commits
+    def on_jobs_delivered(self, items):
+        rows_by_model = defaultdict(list)
+        outbox_rows = defaultdict(list)
+        trackers = defaultdict(list)
+        for item in items:
+            if item.record is not None:
+                model, row = item.record
+                rows_by_model[model].append(row)
+                if item.outbox_id is not None:
+                    outbox_rows[model].append((item.outbox_id, row))
+                if item.tracker is not None:
+                    trackers[model].append(item.tracker)
+        for model, rows in rows_by_model.items():
+            future = self.database_for(model).submit(insert_ignore, model, rows)
+            if outbox_rows[model]:
+                future.add_done_callback(functools.partial(self.release_outbox_rows, model, outbox_rows[model]))
+            if trackers[model]:
+                future.add_done_callback(functools.partial(self.release_trackers, trackers[model]))
+
+    # Outbox rows are deleted only once their jobs are recorded; a crash in between
+    # leaves rows that the next consume recognises as already posted. If recording
+    # fails the rows stay, and the next poll records them again without reposting.
+    def release_outbox_rows(self, model, rows, future):
+        outbox_ids = [outbox_id for outbox_id, _ in rows]
+        self.outbox_inflight.difference_update(outbox_ids)
+        if write_succeeded(future):
+            self.jobs_db.submit(delete_outbox_rows, outbox_ids)
+            return
+        for outbox_id, record in rows:
+            self.outbox_unrecorded[outbox_id] = (model, record)
+        self.outbox_cursor = min(self.outbox_cursor, min(outbox_ids) - 1)
+
+    @staticmethod
+    def release_trackers(trackers, future):
+        error = write_error(future)
+        for tracker in trackers:
+            tracker.release(error)
+
+    # Forgets undelivered jobs so the next scrape (or outbox poll) picks them up again
+    def on_jobs_failed(self, items):
+        outbox_ids = []
+        error = RuntimeError(f"{len(items)} posts could not be delivered")
+        for item in items:
+            if item.tracker is not None:
+                item.tracker.release(error)
+            if item.record is not None and item.record[0] is FreelancerJob:
+                # Otherwise an unchanged page would be skipped and its jobs never retried
+                self.freelancer_fetcher.reset()
+            if item.seen is not None:
+                index, value = item.seen
+                index.discard(value)
+            if item.record is not None and item.record[1].get('fingerprint') is not None:
+                self.fingerprints.discard(item.record[1]['fingerprint'], item.record[1]['feed'])
+            if item.outbox_id is not None:
+                outbox_ids.append(item.outbox_id)
+        if outbox_ids:
+            self.outbox_inflight.difference_update(outbox_ids)
+            self.outbox_cursor = min(self.outbox_cursor, min(outbox_ids) - 1)
+        self.logger.error("Dropped %d undeliverable jobs; they will be retried on the next scrape.", len(items))
+
+    def seen_index(self, name):
+        if name not in self.seen_indexes:
+            self.seen_indexes[name] = SeenIndex(name)
+        return self.seen_indexes[name]
+
+    async def warm_seen_indexes(self):
+        for feed in self.feeds.channels:
+            index = self.seen_index(feed)
+            values = await self.jobs_db.read(newest_values, Job, Job.job_id, index.max_size, Job.feed == feed)
+            index.update(values)
+            self.logger.info("Loaded %d seen ids for feed %s", len(values), feed)
+        index = self.seen_index(FreelancerJob.__tablename__)
+        values = await self.freelancer_db.read(newest_values, FreelancerJob, FreelancerJob.link, index.max_size)
+        index.update(values)
+        self.logger.info("Loaded %d seen links for %s", len(values), FreelancerJob.__tablename__)
+        if FINGERPRINT_WINDOW_DAYS > 0:
+            rows = await self.jobs_db.read(recent_fingerprints, datetime.utcnow() - self.fingerprints.window)
+            for fingerprint, simhash, company, feed, posted_at in rows:
+                self.fingerprints.add(fingerprint, feed, simhash, normalize_company(company), posted_at)
+            self.logger.info("Loaded %d job fingerprints from the last %g days", len(rows), FINGERPRINT_WINDOW_DAYS)
+
+    def seen_index_stats(self):
+        return {name: index.stats() for name, index in self.seen_indexes.items()}
+
+    async def start_metrics(self):
+        self.loop_lag_task = asyncio.create_task(monitor_event_loop_lag(), name="event-loop-lag")
+        if METRICS_PORT:
+            try:
+                self.metrics_runner = await serve_metrics()
+                self.logger.info("Serving metrics on http://%s:%d/metrics", METRICS_HOST, METRICS_PORT)
+            except OSError as e:
+                self.logger.error("Could not start metrics endpoint on %s:%d: %s", METRICS_HOST, METRICS_PORT, e)
+
+    async def close(self) -> None:
+        if self.loop_lag_task is not None:
+            self.loop_lag_task.cancel()
+        if self.startup_task is not None:
+            self.startup_task.cancel()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        self.scheduler.stop()
+        self.maintenance_task.cancel()
+        self.outbox_task.cancel()
+        self.feeds_task.cancel()
+        for queue in self.send_queues.values():
+            queue.stop()
+        await self.freelancer_fetcher.close()
+        await super().close()
+        self.scrape_executor.shutdown(wait=False, cancel_futures=True)
 
     @tasks.loop(minutes=1.0)
     async def status_task(self) -> None:
@@ -258,257 +1844,463 @@ class CombinedJobBot(commands.Bot):
         await self.wait_until_ready()
 
     async def setup_hook(self) -> None:
-        self.logger.info(f"Logged in as {self.user.name}")
-        self.logger.info(f"discord.py API version: {discord.__version__}")
-        self.logger.info(f"Python version: {platform.python_version()}")
+        self.logger.info("Logged in as %s", self.user.name)
+        self.logger.info("discord.py API version: %s", discord.__version__)
+        self.logger.info("Python version: %s", platform.python_version())
         self.logger.info(
-            f"Running on: {platform.system()} {platform.release()} ({os.name})"
+            "Running on: %s %s (%s)", platform.system(), platform.release(), os.name
         )
         self.logger.info("-------------------")
+        await self.start_metrics()
         self.status_task.start()
-        self.job_posting_task.start()  # Start the generic job posting task
-        self.freelancer_job_task.start() # start freelancer
+        self.stats_task.start()
+        if MAINTENANCE_INTERVAL_HOURS > 0:
+            self.maintenance_task.start()
+        self.feeds_task.start()
+        # The gateway connection waits for setup_hook, so warm-up happens in the background
+        self.startup_task = asyncio.create_task(self.start_feeds(), name="start-feeds")
+        self.startup_task.add_done_callback(self.on_startup_done)
+
+    # A failed warm-up would otherwise leave the bot connected but never posting
+    def on_startup_done(self, task):
+        if task.cancelled() or task.exception() is None:
+            return
+        self.startup_failed = True
+        self.logger.error("Could not start the feeds, shutting down", exc_info=task.exception())
+        self.shutdown_task = asyncio.create_task(self.close(), name="shutdown")
+
+    async def start_feeds(self):
+        await self.warm_seen_indexes()
+        if FEED_MODE == 'outbox':
+            self.logger.info("Posting jobs queued by scraper workers")
+            self.outbox_task.start()
+        else:
+            self.schedule_feeds()
+            self.scheduler.start()
+
+    async def on_ready(self) -> None:
+        if not self.connected:
+            self.connected = True
+            self.logger.info("Connected to the gateway %.2fs after start", mark_startup("gateway"))
+
+    # Worker process mode: scrapes and filters feeds, writing new jobs to the outbox
+    # for the bot process instead of connecting to Discord
+    async def run_worker(self, feeds=ENABLED_FEEDS):
+        await self.start_metrics()
+        await self.warm_seen_indexes()
+        self.feeds_task.start()
+        self.schedule_feeds(feeds)
+        self.scheduler.start()
+        await self.scheduler.join()
 
     # --- Generic Job Posting ---
-    async def post_jobs(self, jobs, channel_id: int):
-        target_channel = self.get_channel(channel_id)
-        if target_channel is None:
-            self.logger.error(f"No channel with ID {channel_id} found.")
+    async def post_jobs(self, jobs, channel_id: int, skip_counts=None, tracker=None):
+        queue = self.post_target(channel_id)
+        if queue is None:
+            self.logger.error("No channel with ID %s found.", channel_id)
+            if tracker is not None:
+                tracker.fail(LookupError(f"no channel with ID {channel_id}"))
         else:
-            if channel_id == int(os.getenv('FT_CHANNEL_ID')):
-                JobModel = FullTimeJob
-                quarantine_terms = set()
-                channel_name = "Full-Time Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "entry level", "entry", "mid level", "senior"]
-            elif channel_id == int(os.getenv('BC_CHANNEL_ID')):
-                JobModel = BlockchainJob
-                quarantine_terms = set()
-                channel_name = "Blockchain Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "entry level", "entry", "blockchain", "web3", "solidity", "smart contract", "mid level", "senior"]
-            elif channel_id == int(os.getenv('MO_CHANNEL_ID')):
-                JobModel = MobileJob
-                quarantine_terms = set()
-                channel_name = "Mobile Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "entry level", "entry", "mid level", "senior", "mobile", "ios", "swift", "react native"]
-            elif channel_id == int(os.getenv('ML_CHANNEL_ID')):
-                JobModel = MachinLearningJob
-                quarantine_terms = set()
-                channel_name = "ML Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "entry level", "entry", "mid level", "senior", "machine learning", "ai", "ocr"]
-            elif channel_id == int(os.getenv('INTERN_CHANNEL_ID')):
-                JobModel = InternJob
-                quarantine_terms = set()
-                channel_name = "Intern Jobs"
-                required_terms = ["intern"]
-            elif channel_id == int(os.getenv('NG_2025_CHANNEL_ID')):
-                JobModel = NG2025Job
-                quarantine_terms = quarantined_2025_terms
-                channel_name = "NG 2025 Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "new grad", "entry level", "entry"]
-            elif channel_id == int(os.getenv('NG_2024_CHANNEL_ID')):
-                JobModel = NG2024Job
-                quarantine_terms = quarantined_2024_terms
-                channel_name = "NG 2024 Jobs"
-                required_terms = ["engineer", "technology", "developer", "software", "new grad", "entry level", "entry"]
-            else:
-                self.logger.error(f"Unknown channel ID: {channel_id}")
+            channel_feed = self.feeds.by_channel_id.get(channel_id)
+            if channel_feed is None:
+                self.logger.error("Unknown channel ID: %s", channel_id)
+                if tracker is not None:
+                    tracker.fail(LookupError(f"unknown channel ID {channel_id}"))
                 return
-
-            for index, row in jobs.iterrows():
-                if row['company'] in blacklist_companies:
-                    self.logger.info(
-                        f"Skipping job from blacklisted company: {row['company']} in channel: {channel_name} (ID: {channel_id})")
-                    continue
-
-                if not any(term.lower() in row['title'].lower() for term in required_terms):
-                    self.logger.info(
-                        f"Skipping job with title '{row['title']}' as it does not contain any of the required terms {required_terms} in channel: {channel_name} (ID: {channel_id})")
-                    continue
-
-                if any(term.lower() in row['title'].lower() for term in quarantine_terms):
-                    self.logger.info(
-                        f"Skipping job with quarantined term in title: {row['title']} in channel: {channel_name} (ID: {channel_id})")
+            feed = channel_feed.key
+            channel_name = channel_feed.name
+
+            with FILTER_SECONDS.time(channel=channel_id):
+                candidates, rejections, rejected = channel_feed.title_filter.evaluate(jobs)
+            # Skips are summarised once per feed run; per-row detail only at DEBUG
+            own_summary = skip_counts is None
+            if own_summary:
+                skip_counts = Counter()
+            for reason, count in rejections.items():
+                skip_counts[channel_name, reason] += count
+                ROWS_REJECTED.inc(count, channel=channel_id, reason=reason)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for job, reason in rejected:
+                    self.logger.debug("Skipping job '%s' from %s (%s) in channel: %s (ID: %s)",
+                                      job.title, job.company, reason, channel_name, channel_id)
+
+            # Only ids the seen index doesn't know go to the database, in one IN (...) lookup
+            seen = self.seen_index(feed)
+            unseen = seen.unseen([job.id for job in candidates])
+            seen.update(await self.jobs_db.read(existing_values, Job.job_id, unseen, Job.feed == feed))
+            new_jobs = 0
+            for job in candidates:
+                if job.id in seen:
+                    skip_counts[channel_name, REJECT_DUPLICATE] += 1
+                    ROWS_REJECTED.inc(channel=channel_id, reason=REJECT_DUPLICATE)
+                    self.logger.debug("Job already exists in the database: %s in channel: %s (ID: %s)",
+                                      job.title, channel_name, channel_id)
                     continue
-
-                if any(term.lower() in row['title'].lower() for term in bad_roles):
-                    self.logger.info(
-                        f"Skipping job with bad role in title: {row['title']} in channel: {channel_name} (ID: {channel_id})")
-                    continue
-
-                query = self.generic_session.query(JobModel).filter(JobModel.job_id == row['id']).first()
-                if query is None:
-                    job_info = f""">>> ## {''.join(random.choices(['🎉', '👏', '💼', '🔥', '💻'], k=1))} [{row['company']}](<{row['company_url']}>) just posted a new job! 
+                fingerprint = simhash = None
+                if FINGERPRINT_WINDOW_DAYS > 0:
+                    company = normalize_company(job.company)
+                    fingerprint = job_fingerprint(job.company, job.title, job.location)
+                    if FINGERPRINT_SIMHASH:
+                        simhash = description_simhash(job.description)
+                    if self.fingerprints.match(fingerprint, feed, simhash, company):
+                        skip_counts[channel_name, REJECT_REPOST] += 1
+                        ROWS_REJECTED.inc(channel=channel_id, reason=REJECT_REPOST)
+                        self.logger.debug("Skipping repost of '%s' from %s in channel: %s (ID: %s)",
+                                          job.title, job.company, channel_name, channel_id)
+                        continue
+                    self.fingerprints.add(fingerprint, feed, simhash, company)
+
+                job_info = f"""## {''.join(random.choices(['🎉', '👏', '💼', '🔥', '💻'], k=1))} [{job.company}](<{job.company_url}>) just posted a new job! 
 
 ### **Role:** 
-[**{row['title']}**](<{row['job_url']}>)
+[**{job.title}**](<{job.job_url}>)
 
 ### **Location:** 
-{row['location']}
----
-                    """
-                    self.logger.info(f"Posting job: {row['title']} to channel: {channel_name} (ID: {channel_id})")
-                    self.generic_session.add(JobModel(job_id=row['id'], application_url=row['job_url'], job_title=row['title'],
-                                              company_name=row['company'], company_url=row['company_url'], location=row['location']))
-                    await target_channel.send(job_info)
-                else:
-                    self.logger.info(
-                        f"Job already exists in the database: {row['title']} in channel: {channel_name} (ID: {channel_id})")
-
-            try:
-                self.generic_session.commit()
-            except Exception as e:
-                self.logger.error(f"Error committing session: {e}")
-                self.generic_session.rollback()
-
-    @tasks.loop(seconds=0)
-    async def job_posting_task(self):
-        import asyncio
-        await self.full_time_job_task()
-        await asyncio.sleep(10)
-        await self.blockchain_job_task()
-        await asyncio.sleep(10)
-        await self.mobile_job_task()
-        await asyncio.sleep(10)
-        await self.ml_job_task()
-        await asyncio.sleep(10)
-        # await self.ng_2025_job_task()
-        # await asyncio.sleep(10)
-        # await self.ng_2024_job_task()
-        await asyncio.sleep(10)
-        # await self.intern_job_task()
-        self.logger.info("Job posting task completed.")
-
-    async def full_time_job_task(self):
-        channel_id = int(os.getenv('FT_CHANNEL_ID'))
-        full_time_jobs = await self.get_jobs(search_term="software engineer", results_wanted=50)
-        await self.post_jobs(full_time_jobs, channel_id)
-
-    async def blockchain_job_task(self):
-        channel_id = int(os.getenv('BC_CHANNEL_ID'))
-        full_time_jobs = await self.get_jobs(search_term="blockchain", results_wanted=50)
-        await self.post_jobs(full_time_jobs, channel_id)
-
-    async def mobile_job_task(self):
-        channel_id = int(os.getenv('MO_CHANNEL_ID'))
-        full_time_jobs = await self.get_jobs(search_term="mobile", results_wanted=50)
-        await self.post_jobs(full_time_jobs, channel_id)
-
-    async def ml_job_task(self):
-        channel_id = int(os.getenv('ML_CHANNEL_ID'))
-        full_time_jobs = await self.get_jobs(search_term="machine learning", results_wanted=50)
-        await self.post_jobs(full_time_jobs, channel_id)
-
-    async def intern_job_task(self):
-        channel_id = int(os.getenv('INTERN_CHANNEL_ID'))
-        intern_jobs = await self.get_jobs(hours_old=10)
-        await self.post_jobs(intern_jobs, channel_id)
-
-    async def ng_2025_job_task(self):
-        channel_id = int(os.getenv('NG_2025_CHANNEL_ID'))
-        ng_2025_search_term = self.ng_2025_search_terms[self.ng_2025_search_index]
-
-        self.logger.info(
-            f"Running NG 2025 job task for channel ID: {channel_id} with search term '{ng_2025_search_term}'")
-        jobs = await self.get_jobs(search_term=ng_2025_search_term, hours_old=10)
-        self.logger.info(f"Found {len(jobs)} jobs for NG 2025 channel using '{ng_2025_search_term}'.")
+{job.location}
+---"""
+                self.logger.info("Posting job: %s to channel: %s (ID: %s)", job.title, channel_name, channel_id)
+                # Marked seen now so the next scrape doesn't queue it again; persisted once delivered
+                seen.add(job.id)
+                record = dict(feed=feed, job_id=job.id, application_url=job.job_url, job_title=job.title,
+                              company_name=job.company, company_url=job.company_url, location=job.location,
+                              posted_at=datetime.utcnow(), fingerprint=fingerprint, simhash=simhash)
+                if tracker is not None:
+                    tracker.hold()
+                queue.put(OutboundItem(content=job_info, record=(Job, record), seen=(seen, job.id), tracker=tracker))
+                new_jobs += 1
+            if own_summary:
+                self.log_skip_summary(skip_counts)
+            return new_jobs
 
-        await self.post_jobs(jobs, channel_id)
-        self.ng_2025_search_index = (self.ng_2025_search_index + 1) % len(self.ng_2025_search_terms)
+    def log_skip_summary(self, skip_counts):
+        if not skip_counts:
+            return
+        by_channel = defaultdict(list)
+        for (channel_name, reason), count in sorted(skip_counts.items()):
+            by_channel[channel_name].append(f"{reason}={count}")
+        self.logger.info("Skipped %d jobs: %s", sum(skip_counts.values()),
+                         "; ".join(f"{name}: {', '.join(reasons)}" for name, reasons in by_channel.items()))
+
+    # Brings the scheduler in line with the registry: new feeds start and removed ones
+    # stop. Feeds already running pick up changed settings on their next run.
+    def schedule_feeds(self, names=None):
+        self.scraping = True
+        if names is not None:
+            self.feed_names = names
+        enabled = self.feeds.enabled(self.feed_names)
+        for name in list(self.scheduler.schedules):
+            if name not in enabled or (name != 'freelancer' and name not in self.feeds.searches):
+                self.scheduler.remove(name)
+        for name in sorted(enabled - set(self.scheduler.schedules)):
+            if name == 'freelancer':
+                self.scheduler.add(FeedSchedule('freelancer', self.post_freelancer_jobs))
+            elif name in self.feeds.searches:
+                search = self.feeds.searches[name]
+                self.scheduler.add(FeedSchedule(name, functools.partial(self.run_feed, name), interval=search.interval))
+            else:
+                self.logger.warning("Feed %s is not defined in %s", name, self.feeds.path)
+        self.logger.info("Scheduled feeds: %s", ", ".join(self.scheduler.schedules))
+
+    # Scrapes one search and routes the results through every channel it feeds
+    async def run_feed(self, name):
+        search = self.feeds.searches[name]
+        search_term = search.next_search_term()
+        with SCRAPE_SECONDS.time(feed=name):
+            jobs, checkpoint = await self.get_jobs(sites=search.sites, search_term=search_term, location=search.location,
+                                                   results_wanted=search.results_wanted, hours_old=search.hours_old,
+                                                   descriptions=search.descriptions, owner=name)
+        ROWS_SCRAPED.inc(len(jobs), feed=name)
+        await self.route_jobs([jobs], self.feeds.channel_ids(search.channels), checkpoint)
+        # The scheduler waits on it for the jobs that actually get delivered
+        return checkpoint
+
+    # Picks up edits to FEEDS_FILE; an invalid file is logged and the current feeds kept
+    async def reload_feeds(self):
+        if not self.feeds.changed():
+            return False
+        try:
+            registry = FeedRegistry.load(self.feeds.path)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            self.logger.error("Keeping the current feeds, could not load %s: %r", self.feeds.path, e)
+            with contextlib.suppress(OSError):
+                self.feeds.mtime = os.stat(self.feeds.path).st_mtime_ns
+            return False
+        self.feeds = registry
+        if self.scraping:
+            self.schedule_feeds()
+            self.scheduler.start()
+        self.logger.info("Reloaded %d channels and %d searches from %s",
+                         len(registry.channels), len(registry.searches), registry.path)
+        return True
+
+    @tasks.loop(seconds=FEEDS_RELOAD_SECONDS)
+    async def feeds_task(self):
+        await self.reload_feeds()
+
+    # Returns the number of jobs queued; `tracker` follows their delivery
+    async def route_jobs(self, batches, channel_ids, tracker=None):
+        unique = {}
+        for batch in batches:
+            for job in batch or ():
+                unique.setdefault(job.id, job)
+        jobs = list(unique.values())
+        new_jobs = 0
+        skip_counts = Counter()
+        try:
+            for channel_id in channel_ids if jobs else ():
+                new_jobs += await self.post_jobs(jobs, channel_id, skip_counts, tracker) or 0
+        except BaseException as e:
+            if tracker is not None:
+                tracker.routed(e)
+            raise
+        if tracker is not None:
+            tracker.routed()
+        self.log_skip_summary(skip_counts)
+        return new_jobs
+
+    @tasks.loop(minutes=5)
+    async def stats_task(self):
+        for name, stats in self.seen_index_stats().items():
+            self.logger.info("Seen index %s: size=%d hits=%d misses=%d evictions=%d hit_rate=%.1f%%",
+                             name, stats['size'], stats['hits'], stats['misses'], stats['evictions'],
+                             stats['hit_rate'] * 100)
+        self.logger.info("Scrape cache: size=%d hits=%d misses=%d",
+                         len(self.scrape_cache), self.scrape_cache.hits, self.scrape_cache.misses)
+        self.logger.info("Fingerprint index: size=%d reposts_suppressed=%d", len(self.fingerprints), self.fingerprints.hits)
+        for name, schedule in self.scheduler.schedules.items():
+            self.logger.info("Feed %s: interval=%.0fs runs=%d failures=%d new_jobs=%d",
+                             name, schedule.interval, schedule.runs, schedule.failures, schedule.new_jobs)
+
+    # Posts jobs queued by worker processes. Rows stay in the outbox until their job is
+    # recorded, so anything undelivered at shutdown is picked up again on the next start.
+    async def consume_outbox(self):
+        rows = await self.jobs_db.read(outbox_after, self.outbox_cursor, OUTBOX_BATCH_SIZE)
+        if not rows:
+            return 0
+        self.outbox_cursor = rows[-1]['id']
+        groups = defaultdict(list)
+        unrecorded = defaultdict(list)
+        for row in rows:
+            if row['id'] in self.outbox_unrecorded:
+                model, record = self.outbox_unrecorded.pop(row['id'])
+                unrecorded[model].append((row['id'], record))
+            elif row['id'] not in self.outbox_inflight:
+                groups[row['source'], row['feed']].append(row)
+        for model, retry in unrecorded.items():
+            self.outbox_inflight.update(outbox_id for outbox_id, _ in retry)
+            future = self.database_for(model).submit(insert_ignore, model, [record for _, record in retry])
+            future.add_done_callback(functools.partial(self.release_outbox_rows, model, retry))
+        duplicates = []
+        unknown_channels = defaultdict(list)
+        new_jobs = 0
+        for (source, feed), group in groups.items():
+            model, column, posted_column = OUTBOX_SOURCES[source]
+            criteria = (Job.feed == feed,) if model is Job else ()
+            seen = self.seen_index(feed)
+            unseen = seen.unseen([row['key'] for row in group])
+            seen.update(await self.database_for(model).read(existing_values, column, unseen, *criteria))
+            for row in group:
+                if row['key'] in seen:
+                    duplicates.append(row['id'])
+                    continue
+                channel = self.get_channel(row['channel_id'])
+                if channel is None:
+                    unknown_channels[row['channel_id']].append(row['id'])
+                    continue
+                record = json.loads(row['record'])
+                record[posted_column.key] = datetime.utcnow()
+                embed = None
+                if model is FreelancerJob:
+                    embed = freelancer_embed(record['title'], record['link'], record['description'])
+                seen.add(row['key'])
+                self.outbox_inflight.add(row['id'])
+                self.send_queue(channel).put(OutboundItem(content=row['content'], embed=embed, record=(model, record),
+                                                          seen=(seen, row['key']), outbox_id=row['id']))
+                new_jobs += 1
+        if duplicates:
+            self.jobs_db.submit(delete_outbox_rows, duplicates)
+        # The cursor has moved past these, so they're marked rather than silently left behind
+        for channel_id, outbox_ids in unknown_channels.items():
+            self.jobs_db.submit(dead_letter_outbox_rows, outbox_ids, f"no channel with ID {channel_id}")
+            self.logger.error("Dead-lettered %d outbox jobs: no channel with ID %s found. "
+                              "Clear outbox.dead_letter and restart once the channel is reachable to retry them.",
+                              len(outbox_ids), channel_id)
+        if new_jobs:
+            self.logger.info("Queued %d jobs from the outbox", new_jobs)
+        return new_jobs
+
+    @tasks.loop(seconds=OUTBOX_POLL_SECONDS)
+    async def outbox_task(self):
+        try:
+            await self.consume_outbox()
+        except Exception as e:
+            self.logger.error("Outbox consume failed: %r", e)
 
-    async def ng_2024_job_task(self):
-        channel_id = int(os.getenv('NG_2024_CHANNEL_ID'))
-        current_search_term = self.ng_2024_search_terms[self.ng_2024_search_index]
+    @outbox_task.before_loop
+    async def before_outbox_task(self) -> None:
+        await self.wait_until_ready()
 
+    # Rows past their feed's retention window are deleted a batch per write, so posts
+    # queued in between aren't held up behind one long transaction
+    async def maintain_database(self, database, model, date_column, windows, models):
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        before = await database.read(database_stats, models)
+        await database.write(stamp_undated_rows, model, date_column, now)
+        deleted = 0
+        for days, criteria in windows:
+            if days <= 0:
+                continue
+            cutoff = now - timedelta(days=days)
+            while True:
+                count = await database.write(prune_rows, model, date_column, cutoff, MAINTENANCE_BATCH_SIZE, *criteria)
+                deleted += count
+                if count < MAINTENANCE_BATCH_SIZE:
+                    break
+        trimmed = 0
+        if DESCRIPTION_RETENTION_DAYS > 0:
+            trimmed = await database.write(
+                trim_descriptions, model, date_column, now - timedelta(days=DESCRIPTION_RETENTION_DAYS))
+        compaction = await database.write(compact_database, alone=True)
+        after = await database.read(database_stats, models)
         self.logger.info(
-            f"Running NG 2024 job task for channel ID: {channel_id} with search term '{current_search_term}'")
-        jobs = await self.get_jobs(search_term=current_search_term, hours_old=10)
-        self.logger.info(f"Found {len(jobs)} jobs for NG 2024 channel using '{current_search_term}'.")
+            "Maintenance %s: deleted %d rows, trimmed %d descriptions, %s in %.1fs; size %.1f MiB -> %.1f MiB; rows %s -> %s",
+            database.name, deleted, trimmed, compaction, time.perf_counter() - started,
+            before['size_bytes'] / 1048576, after['size_bytes'] / 1048576, before['rows'], after['rows'])
 
-        await self.post_jobs(jobs, channel_id)
-        self.ng_2024_search_index = (self.ng_2024_search_index + 1) % len(self.ng_2024_search_terms)
+    @tasks.loop(hours=MAINTENANCE_INTERVAL_HOURS or 6)
+    async def maintenance_task(self):
+        feeds = list(self.feeds.channels)
+        try:
+            await self.maintain_database(
+                self.jobs_db, Job, Job.posted_at,
+                [(retention_days(feed), (Job.feed == feed,)) for feed in feeds]
+                + [(RETENTION_DAYS, (Job.feed.notin_(feeds),))],  # feeds since removed from FEEDS_FILE
+                (Job, ScrapeState))
+            await self.maintain_database(
+                self.freelancer_db, FreelancerJob, FreelancerJob.created_at,
+                [(retention_days('freelancer'), ())], (FreelancerJob,))
+        except Exception as e:
+            self.logger.error("Database maintenance failed: %r", e)
+
+    @maintenance_task.before_loop
+    async def before_maintenance_task(self) -> None:
+        await self.wait_until_ready()
 
     async def get_jobs(self, sites=None, search_term='software engineer intern', location='United States, Remote',
-                       results_wanted=50, hours_old=24):
+                       results_wanted=50, hours_old=24, descriptions=False, owner=None):
         if sites is None:
             sites = ['linkedin']
-        jobs = scrape_jobs(
-            site_name=sites,
-            search_term=search_term,
-            location=location,
-            results_wanted=results_wanted,
-            hours_old=hours_old,
-        )
-        return jobs
+        now = datetime.utcnow()
+        states = await self.jobs_db.read(load_scrape_states, sites, search_term, location)
+        previous = {site: states[site].last_success_at for site in sites if site in states}
+        hours_old, results_wanted = incremental_window(states, sites, hours_old, results_wanted, now)
+        key = ScrapeKey(tuple(sorted(sites)), search_term, location, hours_old, results_wanted, descriptions)
+
+        async def scrape():
+            jobs = await self.run_scrape(
+                sites,
+                scrape_job_records,
+                descriptions=descriptions,
+                site_name=sites,
+                search_term=search_term,
+                location=location,
+                results_wanted=results_wanted,
+                hours_old=hours_old,
+            )
+            self.logger.info("Scraped '%s' (%dh, %d wanted): %d results",
+                             search_term, hours_old, results_wanted, len(jobs))
+            return ScrapeRun(sites, search_term, location, now, results_wanted, jobs, previous, time.monotonic())
+
+        # Returns the jobs and the checkpoint to route them with
+        run, replayed = await self.scrape_cache.get(key, scrape, owner)
+        return run.jobs, ScrapeCheckpoint(self.jobs_db, self.scrape_failures, run, replayed)
 
     # --- Freelancer Job Posting ---
     async def fetch_freelancer_jobs(self):
-        try:
-            response = requests.get(self.freelancer_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_cards = soup.find_all('div', class_='JobSearchCard-item')
-
-            new_jobs = []
-            for job in job_cards:
-                title_element = job.find('a', class_='JobSearchCard-primary-heading-link')
-                title = title_element.text.strip() if title_element else "No Title"
-                link = f"https://www.freelancer.com{title_element['href']}" if title_element else "No Link"
-                description_element = job.find('p', class_='JobSearchCard-primary-description')
-                description = description_element.text.strip() if description_element else "No Description"
-                new_jobs.append((title, link, description))
-
-            print(f"New Jobs length", len(new_jobs))
-            return new_jobs
-        except Exception as e:
-            print(f"Error fetching jobs: {e}")
-            return []
+        # Errors propagate so the scheduler can back off. None means the page hasn't changed.
+        with FREELANCER_FETCH_SECONDS.time():
+            body = await self.freelancer_fetcher.fetch()
+            if body is None:
+                return None
+            try:
+                new_jobs = await self.run_scrape(['freelancer'], parse_freelancer_jobs, body)
+            except Exception:
+                self.freelancer_fetcher.reset()
+                raise
+        ROWS_SCRAPED.inc(len(new_jobs), feed='freelancer')
+        self.logger.debug("Parsed %d Freelancer jobs", len(new_jobs))
+        return new_jobs
 
     async def post_freelancer_jobs(self):
-        freelancer_channel_id = int(os.getenv('FREELANCER_CHANNEL_ID'))
-        await self.wait_until_ready()
-        channel = self.get_channel(freelancer_channel_id)
+        freelancer_channel_id = self.feeds.freelancer_channel_id
+        queue = self.post_target(freelancer_channel_id)
 
-        if channel is None:
-            self.logger.error(f"No channel with ID {freelancer_channel_id} found for Freelancer jobs.")
-            return
+        if queue is None:
+            self.logger.error("No channel with ID %s found for Freelancer jobs.", freelancer_channel_id)
+            return 0
 
-        session = FreelancerSession()
         jobs = await self.fetch_freelancer_jobs()
+        if jobs is None:
+            return 0
 
-        for title, link, description in jobs:
-            existing_job = session.query(FreelancerJob).filter_by(link=link).first()
-            if not existing_job:
-                new_job = FreelancerJob(title=title, link=link, description=description)
-                try:
-                    session.add(new_job)
-                    session.commit()
-
-                    embed = discord.Embed(title=title, url=link, description=description, color=0x00ff00)
-                    embed.set_footer(text="Freelancer Job Alert")
-                    await channel.send(embed=embed)
-                    print(f"Sent Freelancer job: {title}")
-                except IntegrityError as e:
-                    session.rollback()
-                    print(f"Freelancer Job already exists: {title}, error: {e}")
-            else:
-                print(f"Freelancer job Existed: {title}")
-        session.close()
+        tracker = DeliveryTracker()
+        try:
+            seen = self.seen_index(FreelancerJob.__tablename__)
+            unseen = seen.unseen([link for _, link, _ in jobs])
+            seen.update(await self.freelancer_db.read(existing_values, FreelancerJob.link, unseen))
+
+            for title, link, description in jobs:
+                if link in seen:
+                    self.logger.debug("Freelancer job Existed: %s", title)
+                    continue
 
-    @tasks.loop(minutes=1)
-    async def freelancer_job_task(self):
-       await self.post_freelancer_jobs()
+                embed = freelancer_embed(title, link, description)
+                seen.add(link)
+                record = dict(title=title, link=link, description=description, created_at=datetime.utcnow())
+                tracker.hold()
+                queue.put(OutboundItem(embed=embed, record=(FreelancerJob, record), seen=(seen, link), tracker=tracker))
+                self.logger.info("Queued Freelancer job: %s", title)
+        except Exception:
+            # The fetcher has already stored this page's ETag/hash; without a reset the
+            # next fetch would see it as unchanged and its jobs would never be posted
+            self.freelancer_fetcher.reset()
+            raise
+        tracker.routed()
+        return tracker
 
 
 # --- Main ---
 async def main():
-    generic_session = Session() # Create session before bot
-    freelancer_session = FreelancerSession()
-    bot = CombinedJobBot(generic_session=generic_session, freelancer_session=freelancer_session) #inject sessions
+    setup_logging()
+    logger.info("Imported in %.2fs", mark_startup("import"))
+    jobs_db, freelancer_db = open_databases(logger) # Create databases before bot
+    logger.info("Databases ready %.2fs after start", mark_startup("databases"))
+    bot = CombinedJobBot(jobs_db=jobs_db, freelancer_db=freelancer_db) #inject databases
     try:
         await bot.start(os.getenv("TOKEN"))
     finally:
         await bot.close()  # Ensure the bot connection is closed
-        generic_session.close() # Close the session after the bot is done
-        freelancer_session.close()
+        await jobs_db.close() # Flush pending writes after the bot is done
+        await freelancer_db.close()
+    if bot.startup_failed:
+        sys.exit(1)  # so a supervisor restarts it
+
+# Scraper worker process for FEED_MODE=outbox: python bot.py worker [feed,feed,...]
+async def run_worker(feeds):
+    setup_logging()
+    jobs_db, freelancer_db = open_databases(logger)
+    worker = CombinedJobBot(jobs_db=jobs_db, freelancer_db=freelancer_db, worker=True)
+    logger.info("Scraper worker started for feeds: %s", feeds)
+    try:
+        await worker.run_worker(feeds)
+    finally:
+        await worker.close()
+        await jobs_db.close()
+        await freelancer_db.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:2] == ["worker"]:
+        asyncio.run(run_worker(sys.argv[2] if len(sys.argv) > 2 else ENABLED_FEEDS))
+    else:
+        asyncio.run(main())